@@ -0,0 +1,31 @@
+import gzip
+import json
+from pathlib import Path
+from typing import Iterator, Optional
+
+from lxml.html import HtmlElement
+
+from pp_crawler.core.parsing import parse_body
+
+
+def load_pages(root: Path, stage: Optional[str] = None) -> Iterator[tuple[str, str]]:
+    for path in sorted(root.rglob("*")):
+        if path.suffix == ".html":
+            yield path.stem, path.read_text(encoding="utf-8", errors="replace")
+        elif path.name.endswith(".json.gz"):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("markup") and (stage is None or entry.get("stage") == stage):
+                yield entry["key"], entry["markup"]
+
+
+def load_bodies(
+    root: Path, stage: Optional[str] = None, limit: int = 0
+) -> list[tuple[str, HtmlElement]]:
+    bodies = []
+    for url, markup in load_pages(root, stage):
+        if (body := parse_body(markup)) is not None:
+            bodies.append((url, body))
+        if limit and len(bodies) >= limit:
+            break
+    return bodies
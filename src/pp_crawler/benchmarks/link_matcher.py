@@ -0,0 +1,104 @@
+import argparse
+import re
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Optional
+
+from lxml import etree
+from lxml.html import HtmlElement
+
+from pp_crawler.benchmarks.corpus import load_bodies
+from pp_crawler.core.link_matcher import LinkMatcher
+from pp_crawler.core.parsing import text
+
+ALL_ANCHORS = etree.XPath("descendant::a")
+PATTERNS = [
+    "политика конфиденциальности",
+    "пользовательское соглашение",
+    "политика безопасности",
+    "правовая информация",
+    "конфиденциальность",
+    "условия обработки персональных данных",
+    "privacy policy",
+]
+
+
+class LegacyLinkMatcher:
+    def __init__(self, privacy_links: list[str]):
+        self.regexes = [
+            re.compile(p.replace(" ", ".*"), re.IGNORECASE) for p in privacy_links
+        ]
+        self.href_re = re.compile(r"^((https?://)?(www\.)?([\w.\-_]+)\.\w+)?(.*$)")
+        self.http_re = re.compile(r"https?:(//)?")
+
+    def match(self, website: str, body: HtmlElement) -> Optional[str]:
+        for link in reversed(ALL_ANCHORS(body)):
+            label = text(link).lower().strip()
+            if not any(r.match(label) for r in self.regexes):
+                return None
+
+            href = link.get("href")
+            if href is None:
+                return None
+
+            if ref := self.href_re.match(href):
+                cleaned_url = self.http_re.sub("", website)
+                return f"http://{cleaned_url}{ref.group(5)}"
+
+        return None
+
+
+def measure(
+    match: Callable[[str, HtmlElement], Optional[str]],
+    bodies: list[tuple[str, HtmlElement]],
+    repeat: int,
+) -> tuple[float, list[Optional[str]]]:
+    results: list[Optional[str]] = []
+    started = perf_counter()
+    for _ in range(repeat):
+        results = [match(url, body) for url, body in bodies]
+    return (perf_counter() - started) / repeat, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="pp_crawler.benchmarks.link_matcher",
+        description="Compare LinkMatcher with the legacy loop on saved homepages",
+    )
+    parser.add_argument("corpus", type=Path, help="Page cache or directory of .html")
+    parser.add_argument("--pattern", action="append", default=[])
+    parser.add_argument("--stage", default="homepage")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    patterns = args.pattern or PATTERNS
+    bodies = load_bodies(args.corpus, args.stage, args.limit)
+    if not bodies:
+        print("No pages found")
+        return 1
+
+    matchers = {
+        "legacy": LegacyLinkMatcher(patterns).match,
+        "current": LinkMatcher(patterns).match,
+    }
+    runs = {name: measure(m, bodies, args.repeat) for name, m in matchers.items()}
+    legacy_time, _ = runs["legacy"]
+    current_time, current = runs["current"]
+
+    pages = len(bodies)
+    print(f"pages: {pages}")
+    for name, (elapsed, results) in runs.items():
+        found = sum(r is not None for r in results)
+        agree = sum(a == b for a, b in zip(results, current))
+        print(
+            f"{name:>10}: {elapsed * 1000 / pages:.3f} ms/page, "
+            f"found {found}/{pages}, "
+            f"agrees with current on {agree}/{pages}, "
+            f"{legacy_time / max(elapsed, 1e-9):.1f}x legacy speed"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
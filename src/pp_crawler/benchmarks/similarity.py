@@ -0,0 +1,206 @@
+import argparse
+import random
+import re
+from difflib import SequenceMatcher
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Optional
+
+from pp_crawler.core.similarity import SimilarityScorer, domain_of
+
+MANUFACTURERS = [
+    ("Amazon Basics", "amazon.com"),
+    ("Anker", "anker.com"),
+    ("Apple", "apple.com"),
+    ("Arlo Technologies", "arlo.com"),
+    ("Aqara", "aqara.com"),
+    ("Belkin International", "belkin.com"),
+    ("Blink", "blinkforhome.com"),
+    ("Bosch", "bosch-home.com"),
+    ("Ecobee Inc.", "ecobee.com"),
+    ("Eufy", "eufy.com"),
+    ("Eve Systems GmbH", "evehome.com"),
+    ("Gosund", "gosund.com"),
+    ("Govee", "govee.com"),
+    ("Honeywell Home", "honeywellhome.com"),
+    ("iRobot", "irobot.com"),
+    ("Kasa Smart", "kasasmart.com"),
+    ("Lenovo", "lenovo.com"),
+    ("LIFX", "lifx.com"),
+    ("Logitech", "logitech.com"),
+    ("Lutron Electronics Co., Inc.", "lutron.com"),
+    ("Meross", "meross.com"),
+    ("Nanoleaf", "nanoleaf.me"),
+    ("Netatmo", "netatmo.com"),
+    ("Philips Hue", "philips-hue.com"),
+    ("Reolink", "reolink.com"),
+    ("Ring", "ring.com"),
+    ("Roborock", "roborock.com"),
+    ("Samsung SmartThings", "smartthings.com"),
+    ("Sengled", "sengled.com"),
+    ("Shelly", "shelly.cloud"),
+    ("SimpliSafe", "simplisafe.com"),
+    ("Sonos", "sonos.com"),
+    ("Switchbot", "switch-bot.com"),
+    ("TP-Link", "tp-link.com"),
+    ("Wemo", "wemo.com"),
+    ("Wyze Labs", "wyze.com"),
+    ("Xiaomi", "mi.com"),
+    ("Yale", "shopyalehome.com"),
+    ("Yeelight", "yeelight.com"),
+    ("Zooz", "getzooz.com"),
+]
+NOISE = [
+    "amazon.com",
+    "walmart.com",
+    "bestbuy.com",
+    "en.wikipedia.org",
+    "youtube.com",
+    "reddit.com",
+    "homedepot.com",
+    "target.com",
+    "cnet.com",
+    "theverge.com",
+]
+
+
+class LegacyFilter:
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.regex_href = re.compile(r"^((https?://)?(www\.)?([\w.\-_]+)(\.\w+)).*$")
+        self.regex_request = re.compile(r"[^\w ]+|\s{2,}")
+
+    def pieces(self, content: str) -> list[str]:
+        content_list = self.regex_request.sub(" ", content).split()
+        if len(content_list) > 1:
+            content_list.append("".join(content_list))
+        return content_list
+
+    def best(self, content: str, cites: list[str]) -> Optional[str]:
+        best_url = None
+        best_similarity = self.threshold
+
+        content_list = self.pieces(content)
+        for cite in cites:
+            m = self.regex_href.match(cite)
+            if not m:
+                break
+
+            domain = m.group(4)
+            for piece in content_list:
+                sim = SequenceMatcher(None, piece, domain).ratio()
+                if not (sim <= best_similarity and domain not in piece):
+                    return best_url
+
+                w3 = m.group(3) or ""
+                best_url = f"http://{w3}{domain}{m.group(5)}"
+                best_similarity = sim
+
+        return best_url
+
+
+class FullScanFilter(LegacyFilter):
+    def best(self, content: str, cites: list[str]) -> Optional[str]:
+        best_url = None
+        best_similarity = self.threshold
+
+        content_list = [p.lower() for p in self.pieces(content)]
+        for cite in cites:
+            m = self.regex_href.match(cite)
+            if not m:
+                continue
+
+            domain = m.group(4).lower()
+            for piece in content_list:
+                sim = SequenceMatcher(None, piece, domain).ratio()
+                if sim > best_similarity:
+                    w3 = m.group(3) or ""
+                    best_url = f"http://{w3}{domain}{m.group(5)}"
+                    best_similarity = sim
+
+        return best_url
+
+
+def load_manufacturers(path: Optional[Path]) -> list[tuple[str, str]]:
+    if path is None:
+        return MANUFACTURERS
+    rows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        name, _, domain = line.partition("\t")
+        if name.strip() and domain.strip():
+            rows.append((name.strip(), domain.strip()))
+    return rows
+
+
+def make_serps(
+    manufacturers: list[tuple[str, str]], size: int, seed: int
+) -> list[tuple[str, str, list[str]]]:
+    rng = random.Random(seed)
+    domains = [d for _, d in manufacturers] + NOISE
+    serps = []
+    for name, domain in manufacturers:
+        others = rng.sample([d for d in domains if d != domain], size - 1)
+        others.insert(rng.randrange(size), domain)
+        cites = [f"https://www.{d} › {name.lower().split()[0]}" for d in others]
+        serps.append((name, domain, cites))
+    return serps
+
+
+def host(url: Optional[str]) -> Optional[str]:
+    domain = domain_of(url) if url else None
+    return domain[0].removeprefix("www.") if domain else None
+
+
+def measure(
+    best: Callable[[str, list[str]], Optional[str]],
+    serps: list[tuple[str, str, list[str]]],
+    repeat: int,
+) -> tuple[float, int]:
+    results: list[Optional[str]] = []
+    started = perf_counter()
+    for _ in range(repeat):
+        results = [best(name, cites) for name, _, cites in serps]
+    elapsed = (perf_counter() - started) / repeat
+    correct = sum(host(r) == d for r, (_, d, _) in zip(results, serps))
+    return elapsed, correct
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="pp_crawler.benchmarks.similarity",
+        description="Compare SimilarityScorer with SequenceMatcher on result pages",
+    )
+    parser.add_argument(
+        "--manufacturers",
+        type=Path,
+        default=None,
+        help="Tab separated file of manufacturer names and websites",
+    )
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    serps = make_serps(load_manufacturers(args.manufacturers), args.size, args.seed)
+    scorers = {
+        "legacy": LegacyFilter(args.threshold).best,
+        "full-scan": FullScanFilter(args.threshold).best,
+        "scorer": SimilarityScorer(args.threshold).best,
+    }
+    runs = {name: measure(best, serps, args.repeat) for name, best in scorers.items()}
+    scorer_time = runs["scorer"][0]
+
+    total = len(serps)
+    print(f"result pages: {total}, cites per page: {args.size}")
+    for name, (elapsed, correct) in runs.items():
+        print(
+            f"{name:>10}: {elapsed * 1000 / total:.3f} ms/page, "
+            f"correct {correct}/{total}, "
+            f"scorer is {elapsed / max(scorer_time, 1e-9):.1f}x faster"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
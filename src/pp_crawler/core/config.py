@@ -10,6 +10,8 @@ class PathConfig:
     html_path: Path
     explicit_file: Path
     descriptor_file: Path
+    cache_path: Path
+    resolution_file: Path
 
     @staticmethod
     def build(
@@ -17,6 +19,8 @@ class PathConfig:
         html_path: str,
         explicit_file: str,
         descriptor_file: str,
+        cache_path: str = "cache",
+        resolution_file: str = "resolutions.sqlite",
         **kwargs: Any,
     ) -> "PathConfig":
         r = Path(resources_path).expanduser()
@@ -26,29 +30,153 @@ class PathConfig:
             "html_path": r / html_path,
             "explicit_file": r / explicit_file,
             "descriptor_file": r / descriptor_file,
+            "cache_path": r / cache_path,
+            "resolution_file": r / resolution_file,
         }
         return PathConfig(**transformed)
 
 
+AD_HOSTS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "hotjar.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "mc.yandex.ru",
+    "an.yandex.ru",
+    "top-fwz1.mail.ru",
+]
+
+
+@dataclass
+class ResourcePolicy:
+    block_images: bool = True
+    block_media: bool = True
+    block_fonts: bool = True
+    block_stylesheets: bool = False
+    block_hosts: list[str] = field(default_factory=lambda: list(AD_HOSTS))
+
+    @staticmethod
+    def build(**kwargs: Any) -> "ResourcePolicy":
+        return ResourcePolicy(**kwargs)
+
+
 @dataclass
 class DriverConfig:
     profile_path: Optional[Path]
     log_path: Path = field(default_factory=lambda: Path("./.geckodriver.log"))
     temp_dir: Path = field(default_factory=lambda: Path("./.tmp"))
+    profile_dir: Optional[Path] = None
     dotfile: Path = field(default_factory=lambda: Path("./.driver"))
     log_level: int = 0
     private: bool = True
     no_cache: bool = True
     headless: bool = True
+    prewarm: bool = True
     page_load_timeout: int = 30
+    page_load_strategy: str = "normal"
+    ready_timeout: int = 10
+    tabs: int = 1
     max_error_attempts: int = 10
     max_captcha_attempts: int = 10
     max_timeout_attempts: int = 10
+    max_soft_recoveries: int = 3
+    max_rss_mb: int = 0
+    rss_check_pages: int = 25
+    max_pages: int = 0
     user_agents: list[str] = field(default_factory=list)
+    resources: ResourcePolicy = field(default_factory=ResourcePolicy)
+
+    @staticmethod
+    def build(
+        resources: Optional[dict[str, Any]] = None, **kwargs: Any
+    ) -> "DriverConfig":
+        return DriverConfig(
+            resources=ResourcePolicy.build(**(resources or {})), **kwargs
+        )
+
+
+@dataclass
+class FetchConfig:
+    mode: str = "auto"
+    timeout: int = 15
+    max_redirects: int = 10
+    pool_connections: int = 32
+    pool_maxsize: int = 4
+    min_text_length: int = 200
+    host_burst: int = 1
+    host_concurrency: int = 0
+    host_intervals: dict[str, float] = field(default_factory=dict)
+    browser_extraction: bool = True
+    browser_domains: list[str] = field(default_factory=list)
+    http_domains: list[str] = field(default_factory=list)
+
+    @staticmethod
+    def build(**kwargs: Any) -> "FetchConfig":
+        return FetchConfig(**kwargs)
+
+
+@dataclass
+class CacheConfig:
+    enabled: bool = False
+    replay: bool = False
+    default_ttl: float = 7 * 24 * 60 * 60
+    ttl: dict[str, float] = field(default_factory=dict)
+
+    @staticmethod
+    def build(**kwargs: Any) -> "CacheConfig":
+        return CacheConfig(**kwargs)
+
+
+@dataclass
+class ResolutionConfig:
+    enabled: bool = True
+    default_ttl: float = 30 * 24 * 60 * 60
+    negative_ttl: float = 3 * 24 * 60 * 60
+    ttl: dict[str, float] = field(default_factory=dict)
+
+    @staticmethod
+    def build(**kwargs: Any) -> "ResolutionConfig":
+        return ResolutionConfig(**kwargs)
+
+
+@dataclass
+class PaginationConfig:
+    min_new: int = 1
+    patience: int = 1
+    lookahead: int = 2
+    extend_new: int = 0
+    max_pages: int = 0
+
+    @staticmethod
+    def build(**kwargs: Any) -> "PaginationConfig":
+        return PaginationConfig(**kwargs)
+
+
+@dataclass
+class MemoryConfig:
+    enabled: bool = True
+    high_watermark: float = 85.0
+    low_watermark: float = 70.0
+    min_workers: int = 1
+    interval: float = 5.0
+    poll: float = 1.0
 
     @staticmethod
-    def build(**kwargs: Any) -> "DriverConfig":
-        return DriverConfig(**kwargs)
+    def build(**kwargs: Any) -> "MemoryConfig":
+        return MemoryConfig(**kwargs)
 
 
 @dataclass
@@ -57,12 +185,27 @@ class Config:
     driver: DriverConfig
     pipeline: str
     proc_count: int
+    executor: str = "pool"
+    concurrency: int = 64
+    streaming: bool = False
+    stream_window: int = 256
+    fetch: FetchConfig = field(default_factory=FetchConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    memory: MemoryConfig = field(default_factory=MemoryConfig)
+    resolutions: ResolutionConfig = field(default_factory=ResolutionConfig)
+    pagination: PaginationConfig = field(default_factory=PaginationConfig)
+    engines: list[dict[str, Any]] = field(default_factory=list)
 
     @staticmethod
     def build(
         path: dict[str, str],
         driver: dict[str, Any],
         proc_count: int = -1,
+        fetch: Optional[dict[str, Any]] = None,
+        cache: Optional[dict[str, Any]] = None,
+        memory: Optional[dict[str, Any]] = None,
+        resolutions: Optional[dict[str, Any]] = None,
+        pagination: Optional[dict[str, Any]] = None,
         **kwargs: Any,
     ) -> "Config":
         transformed = {
@@ -70,5 +213,10 @@ class Config:
             "proc_count": proc_count if proc_count > 1 else cpu_count(),
             "path": PathConfig.build(**path),
             "driver": DriverConfig.build(**driver),
+            "fetch": FetchConfig.build(**(fetch or {})),
+            "cache": CacheConfig.build(**(cache or {})),
+            "memory": MemoryConfig.build(**(memory or {})),
+            "resolutions": ResolutionConfig.build(**(resolutions or {})),
+            "pagination": PaginationConfig.build(**(pagination or {})),
         }
         return Config(**transformed)
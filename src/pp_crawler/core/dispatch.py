@@ -0,0 +1,106 @@
+import queue
+from functools import partial
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+from pp_crawler.core.executor import Executor
+from pp_crawler.core.functions import get_logger
+from pp_crawler.core.metrics import Metrics
+
+T = TypeVar("T")
+
+
+class Dispatcher:
+    def __init__(self, pool: Executor, func: Callable[[Any], Any], size: int):
+        self._pool = pool
+        self._func = func
+        self.size = max(1, size)
+        self.in_flight = 0
+        self._done: queue.Queue[tuple[Any, Any, Optional[BaseException]]] = (
+            queue.Queue()
+        )
+        self._started = self._last = perf_counter()
+        self._busy = 0.0
+        self._waited = 0.0
+        self._tasks = 0
+
+    def full(self) -> bool:
+        return self.in_flight >= self.size
+
+    def submit(self, tag: Any, arg: Any) -> None:
+        self._tick()
+        self.in_flight += 1
+        self._tasks += 1
+        self._pool.apply_async(
+            self._func,
+            (arg,),
+            callback=partial(self._put, tag),
+            error_callback=partial(self._fail, tag),
+        )
+
+    def next(self, block: bool = True) -> Optional[tuple[Any, Any]]:
+        started = perf_counter()
+        try:
+            tag, result, error = self._done.get(block=block)
+        except queue.Empty:
+            return None
+        self._waited += perf_counter() - started
+        self._tick()
+        self.in_flight -= 1
+        if error:
+            raise error
+        return tag, result
+
+    def report(self, name: str) -> None:
+        self._tick()
+        elapsed = max(perf_counter() - self._started, 1e-9)
+        busy = self._busy / (elapsed * self.size)
+        Metrics.incr(f"dispatch.{name}.tasks", self._tasks)
+        Metrics.incr(f"dispatch.{name}.wait_ms", int(self._waited * 1000))
+        get_logger().info(
+            f"Dispatched {self._tasks} {name} tasks in {elapsed:.1f}s, "
+            f"window {busy:.0%} busy, waited {self._waited:.1f}s for results"
+        )
+
+    def _tick(self) -> None:
+        now = perf_counter()
+        self._busy += self.in_flight * (now - self._last)
+        self._last = now
+
+    def _put(self, tag: Any, result: Any) -> None:
+        self._done.put((tag, result, None))
+
+    def _fail(self, tag: Any, error: BaseException) -> None:
+        self._done.put((tag, None, error))
+
+
+def imap_window(
+    pool: Executor,
+    func: Callable[[Any], T],
+    iterable: Iterable[Any],
+    size: int = 64,
+    name: str = "tasks",
+) -> Iterator[T]:
+    dispatcher = Dispatcher(pool, func, size)
+    buffer: dict[int, T] = {}
+    head = 0
+
+    def collect(block: bool) -> Iterator[T]:
+        nonlocal head
+        while done := dispatcher.next(block):
+            buffer[done[0]] = done[1]
+            block = False
+        while head in buffer:
+            yield buffer.pop(head)
+            head += 1
+
+    for index, item in enumerate(iterable):
+        while dispatcher.in_flight + len(buffer) >= dispatcher.size:
+            yield from collect(True)
+        dispatcher.submit(index, item)
+        yield from collect(False)
+
+    while dispatcher.in_flight:
+        yield from collect(True)
+
+    dispatcher.report(name)
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Protocol,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+POOL = "pool"
+ASYNC = "async"
+
+
+class Executor(Protocol):
+    def imap(self, func: Callable[[Any], T], iterable: Iterable[Any]) -> Iterator[T]:
+        pass
+
+    def apply_async(
+        self,
+        func: Callable[..., T],
+        args: Iterable[Any] = (),
+        kwds: Mapping[str, Any] = {},
+        callback: Optional[Callable[[T], object]] = None,
+        error_callback: Optional[Callable[[BaseException], object]] = None,
+    ) -> Any:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def terminate(self) -> None:
+        pass
+
+    def join(self) -> None:
+        pass
+
+
+class AsyncExecutor:
+    def __init__(self, concurrency: int):
+        self._concurrency = max(1, concurrency)
+        self._threads = ThreadPoolExecutor(
+            max_workers=self._concurrency, thread_name_prefix="crawler"
+        )
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(self._threads)
+        self._limit = asyncio.Semaphore(self._concurrency)
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="crawler-loop", daemon=True
+        )
+        self._thread.start()
+
+    async def _call(self, func: Callable[..., T], *args: Any) -> T:
+        async with self._limit:
+            return await asyncio.to_thread(func, *args)
+
+    def submit(self, func: Callable[..., T], *args: Any) -> Future[T]:
+        return asyncio.run_coroutine_threadsafe(self._call(func, *args), self._loop)
+
+    def apply_async(
+        self,
+        func: Callable[..., T],
+        args: Iterable[Any] = (),
+        kwds: Mapping[str, Any] = {},
+        callback: Optional[Callable[[T], object]] = None,
+        error_callback: Optional[Callable[[BaseException], object]] = None,
+    ) -> Future[T]:
+        future = self.submit(partial(func, **kwds), *args)
+
+        def done(f: Future[T]) -> None:
+            if f.cancelled():
+                return
+            if error := f.exception():
+                if error_callback:
+                    error_callback(error)
+            elif callback:
+                callback(f.result())
+
+        future.add_done_callback(done)
+        return future
+
+    def imap(self, func: Callable[[Any], T], iterable: Iterable[Any]) -> Iterator[T]:
+        window: deque[Future[T]] = deque()
+        for item in iterable:
+            window.append(self.submit(func, item))
+            if len(window) >= self._concurrency * 2:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+    def close(self) -> None:
+        self._threads.shutdown(wait=True)
+
+    def terminate(self) -> None:
+        self._threads.shutdown(wait=False, cancel_futures=True)
+
+    def join(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
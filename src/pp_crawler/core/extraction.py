@@ -0,0 +1,153 @@
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from lxml import etree
+from lxml.html import HtmlElement
+
+from pp_crawler.core.metrics import Metrics
+from pp_crawler.core.parsing import text
+
+T = TypeVar("T")
+
+
+class BrowserTemplate(ABC, Generic[T]):
+    @abstractmethod
+    def program(self) -> dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def from_data(self, data: Any) -> T:
+        pass
+
+    @abstractmethod
+    def __call__(self, body: HtmlElement) -> T:
+        pass
+
+
+class AttributeTemplate(BrowserTemplate[list[str]]):
+    def __init__(self, path: str, attribute: str, prefix: str = ""):
+        self.path = path
+        self.attribute = attribute
+        self.prefix = prefix
+        self._nodes = etree.XPath(path)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return AttributeTemplate, (self.path, self.attribute, self.prefix)
+
+    def program(self) -> dict[str, Any]:
+        return {"kind": "attributes", "path": self.path, "attribute": self.attribute}
+
+    def from_data(self, data: Any) -> list[str]:
+        return [f"{self.prefix}{value}" for value in data if value is not None]
+
+    def __call__(self, body: HtmlElement) -> list[str]:
+        return self.from_data(node.get(self.attribute) for node in self._nodes(body))
+
+
+class TextTemplate(BrowserTemplate[list[str]]):
+    def __init__(self, path: str):
+        self.path = path
+        self._nodes = etree.XPath(path)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return TextTemplate, (self.path,)
+
+    def program(self) -> dict[str, Any]:
+        return {"kind": "texts", "path": self.path}
+
+    def from_data(self, data: Any) -> list[str]:
+        return [" ".join(value.split()) for value in data if value]
+
+    def __call__(self, body: HtmlElement) -> list[str]:
+        return self.from_data(text(node) for node in self._nodes(body))
+
+
+@dataclass(frozen=True)
+class ExtractionSpec:
+    name: str
+    container: str
+    row: str
+    label: str
+    value: str
+    pattern: str
+    label_noise: str = r"[^\w]|_"
+    value_noise: str = r"[^\w ]|_"
+    fallback: bool = False
+
+
+class CompiledSpec:
+    def __init__(self, spec: ExtractionSpec):
+        self.spec = spec
+        self.containers = etree.XPath(f"descendant::{spec.container}")
+        self.rows = etree.XPath(spec.row)
+        self.label = etree.XPath(f"string({spec.label})")
+        self.value = etree.XPath(f"string({spec.value})")
+        self.pattern = re.compile(spec.pattern, flags=re.IGNORECASE)
+        self.label_noise = re.compile(spec.label_noise)
+        self.value_noise = re.compile(spec.value_noise)
+
+    def normalize(self, label: str, value: str) -> Optional[str]:
+        if not self.pattern.fullmatch(self.label_noise.sub("", label)):
+            return None
+        return self.value_noise.sub("", value).lower().strip() or None
+
+    def extract(self, body: HtmlElement) -> Optional[str]:
+        for container in self.containers(body):
+            for row in self.rows(container):
+                if value := self.normalize(self.label(row), self.value(row)):
+                    return value
+        return None
+
+
+class Extractor(BrowserTemplate[Optional[str]]):
+    def __init__(self, specs: tuple[ExtractionSpec, ...]):
+        self.specs = specs
+        self._compiled = [CompiledSpec(s) for s in specs]
+        self._hits: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._order = list(self._compiled)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return compile_specs, (self.specs,)
+
+    def program(self) -> dict[str, Any]:
+        return {"kind": "rows", "specs": [asdict(s) for s in self.specs]}
+
+    def from_data(self, data: Any) -> Optional[str]:
+        found: dict[str, str] = {}
+        compiled = {c.spec.name: c for c in self._compiled}
+        for name, label, value in data or []:
+            if name not in found and (c := compiled.get(name)):
+                if extracted := c.normalize(label, value):
+                    found[name] = extracted
+        return self._select(lambda c: found.get(c.spec.name))
+
+    def __call__(self, body: HtmlElement) -> Optional[str]:
+        return self._select(lambda c: c.extract(body))
+
+    def _select(
+        self, value_of: Callable[[CompiledSpec], Optional[str]]
+    ) -> Optional[str]:
+        for c in self._order:
+            if value := value_of(c):
+                return self._hit(c.spec, value)
+        return None
+
+    def _hit(self, spec: ExtractionSpec, value: str) -> str:
+        with self._lock:
+            self._hits[spec.name] += 1
+            self._order = sorted(
+                self._order, key=lambda c: (c.spec.fallback, -self._hits[c.spec.name])
+            )
+        Metrics.incr(f"extraction.{spec.name}.hits")
+        return value
+
+
+@lru_cache(maxsize=None)
+def compile_specs(specs: tuple[ExtractionSpec, ...]) -> Extractor:
+    return Extractor(specs)
@@ -4,15 +4,30 @@ import logging
 import os
 import shutil
 from pathlib import Path
-from typing import Any, Callable, Generator, Iterable, Iterator, Optional, Type, cast
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    Type,
+    TypeVar,
+    cast,
+)
 
-from bs4 import BeautifulSoup, Tag
 from file_read_backwards import FileReadBackwards  # type: ignore
+from lxml.html import HtmlElement
 
 from pp_crawler.core.config import Config, PathConfig
+from pp_crawler.core.extraction import BrowserTemplate
+from pp_crawler.core.parsing import parse_body
 from pp_crawler.crawler.item import Item
 from pp_crawler.crawler.modules.module import Module
-from pp_crawler.crawler.web.driver import Driver
+from pp_crawler.crawler.web.fetcher import AUTO, Fetcher
+from pp_crawler.crawler.web.page import Page
+
+T = TypeVar("T")
 
 
 def get_logger() -> logging.Logger:
@@ -43,9 +58,24 @@ def load_last_id_page(path: Path) -> tuple[Optional[int], Optional[str]]:
     return None, None
 
 
-def temp_descriptor(descriptor: Path, suffix: str, label: str) -> Path:
+def load_max_id(path: Path) -> Optional[int]:
+    if not path.exists():
+        return None
+    max_id = None
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if (i := json.loads(line).get("id")) is not None:
+                max_id = i if max_id is None else max(max_id, i)
+    return max_id
+
+
+def temp_descriptor(
+    descriptor: Path, suffix: str, label: str, extension: Optional[str] = None
+) -> Path:
     temp = descriptor.with_name(
-        f".{descriptor.stem}.{suffix}.{label}{descriptor.suffix}"
+        f".{descriptor.stem}.{suffix}.{label}{extension or descriptor.suffix}"
     )
     temp.touch()
     return temp
@@ -60,24 +90,89 @@ def concat_files(
                 shutil.copyfileobj(in_f, out_f, length=buffer_size)
 
 
-def get_soup_from_url(
-    url: str, cooldown: float = 0.0, random_cooldown: float = 0.0
-) -> Optional[Tag]:
-    driver = Driver.spawn()
-    driver.get(url, cooldown=cooldown, random_cooldown=random_cooldown)
-    markup = driver.source()
-    if not markup:
+def commit_models(
+    descriptor: Path, records: Path, scratch: Path, cls: Type[Item]
+) -> None:
+    start = int(load_max_id(descriptor) or 0) + 1
+    scratch.write_text("", encoding="utf-8")
+    for models in chunked(read_models(records, cls), 1024):
+        for i, model in enumerate(models, start=start):
+            model.id = i
+        start += len(models)
+        write_models(scratch, models, mode="a")
+
+    scratch.replace(records)
+    concat_files([descriptor, records], scratch)
+    scratch.replace(descriptor)
+
+
+def get_body_from_url(
+    url: str,
+    cooldown: float = 0.0,
+    random_cooldown: float = 0.0,
+    mode: str = AUTO,
+    stage: str = "default",
+    resources: Optional[dict[str, Any]] = None,
+    ready: Optional[str] = None,
+) -> Optional[HtmlElement]:
+    page = Fetcher.fetch(
+        url,
+        cooldown,
+        random_cooldown,
+        mode=mode,
+        stage=stage,
+        resources=resources,
+        ready=ready,
+    )
+    return page_body(page)
+
+
+def page_body(page: Optional[Page]) -> Optional[HtmlElement]:
+    if not page:
         return None
-    body = BeautifulSoup(markup, "lxml").find("body")
-    return body if isinstance(body, Tag) else None
+    return parse_body(page.markup)
 
 
-def gen_search_urls(
-    template: str, keywords: list[Optional[str]], pages: int
-) -> Iterator[tuple[str, Optional[str]]]:
-    for keyword in keywords:
-        for page in range(1, pages + 1):
-            yield template.format(keyword=keyword, page=page), keyword
+def page_fetched(page: Optional[Page]) -> bool:
+    return page is not None and (page.data is not None or bool(page.markup))
+
+
+def program_of(template: Callable[[HtmlElement], Any]) -> Optional[dict[str, Any]]:
+    return template.program() if isinstance(template, BrowserTemplate) else None
+
+
+def extract_page(
+    page: Optional[Page], template: Callable[[HtmlElement], T]
+) -> Optional[T]:
+    if not page:
+        return None
+    if page.data is not None and isinstance(template, BrowserTemplate):
+        return cast(T, template.from_data(page.data))
+    body = parse_body(page.markup)
+    return template(body) if body is not None else None
+
+
+def extract_from_url(
+    url: str,
+    template: Callable[[HtmlElement], T],
+    cooldown: float = 0.0,
+    random_cooldown: float = 0.0,
+    mode: str = AUTO,
+    stage: str = "default",
+    resources: Optional[dict[str, Any]] = None,
+    ready: Optional[str] = None,
+) -> Optional[T]:
+    page = Fetcher.fetch(
+        url,
+        cooldown,
+        random_cooldown,
+        mode=mode,
+        stage=stage,
+        resources=resources,
+        ready=ready,
+        program=program_of(template),
+    )
+    return extract_page(page, template)
 
 
 def skip_to(
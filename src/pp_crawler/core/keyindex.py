@@ -0,0 +1,105 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+
+class KeyIndex:
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS keys ("
+            " key TEXT PRIMARY KEY,"
+            " task TEXT NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 1,"
+            " resolved INTEGER NOT NULL DEFAULT 0,"
+            " value TEXT)"
+        )
+        self._conn.commit()
+
+    def scan(self, pairs: Iterable[tuple[str, Any]]) -> int:
+        with self._conn:
+            self._conn.execute("UPDATE keys SET hits = 0")
+            self._conn.executemany(
+                "INSERT INTO keys (key, task) VALUES (?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET hits = hits + 1",
+                ((key, json.dumps(task)) for key, task in pairs),
+            )
+            self._conn.execute("DELETE FROM keys WHERE hits = 0")
+        row = self._conn.execute("SELECT COUNT(*) FROM keys").fetchone()
+        return int(row[0])
+
+    def resolved(self) -> int:
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM keys WHERE resolved = 1"
+        ).fetchone()
+        return int(row[0])
+
+    def pending(self) -> Iterator[tuple[str, Any]]:
+        self._conn.execute("DROP TABLE IF EXISTS temp.queue")
+        self._conn.execute(
+            "CREATE TEMP TABLE queue AS SELECT key, task FROM keys"
+            " WHERE resolved = 0 ORDER BY hits DESC"
+        )
+        for key, task in self._conn.execute(
+            "SELECT key, task FROM temp.queue ORDER BY rowid"
+        ):
+            yield key, json.loads(task)
+
+    def resolve(self, key: str, value: Optional[str]) -> None:
+        self._conn.execute(
+            "UPDATE keys SET resolved = 1, value = ? WHERE key = ?", (value, key)
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT value FROM keys WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def remove(self) -> None:
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{self.path}{suffix}").unlink(missing_ok=True)
+
+
+class PairIndex:
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pairs ("
+            " first TEXT NOT NULL,"
+            " second TEXT NOT NULL,"
+            " PRIMARY KEY (first, second)) WITHOUT ROWID"
+        )
+        self._conn.execute("DELETE FROM pairs")
+
+    def update(self, pairs: Iterable[tuple[Optional[str], Optional[str]]]) -> None:
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO pairs (first, second) VALUES (?, ?)",
+                ((first or "", second or "") for first, second in pairs),
+            )
+
+    def add(self, first: Optional[str], second: Optional[str]) -> bool:
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO pairs (first, second) VALUES (?, ?)",
+            (first or "", second or ""),
+        )
+        return cursor.rowcount == 1
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,88 @@
+import random
+import threading
+from contextlib import contextmanager
+from time import sleep, time
+from typing import Any, Iterator, MutableMapping, Optional
+from urllib.parse import urlsplit
+
+from pp_crawler.core.metrics import Metrics
+
+
+def host_key(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host.removeprefix("www.")
+
+
+class HostLimiter:
+    _schedule: MutableMapping[str, float] = {}
+    _lock: Any = threading.Lock()
+    _burst: int = 1
+    _intervals: dict[str, float] = {}
+    _concurrency: int = 0
+    _slots: dict[str, threading.BoundedSemaphore] = {}
+    _slots_lock = threading.Lock()
+
+    @classmethod
+    def set_state(
+        cls,
+        schedule: MutableMapping[str, float],
+        lock: Any,
+        burst: int = 1,
+        intervals: Optional[dict[str, float]] = None,
+        concurrency: int = 0,
+    ) -> None:
+        cls._schedule = schedule
+        cls._lock = lock
+        cls._burst = max(1, burst)
+        cls._intervals = intervals or {}
+        cls._concurrency = concurrency
+        cls._slots = {}
+
+    @classmethod
+    @contextmanager
+    def slot(cls, url: str) -> Iterator[None]:
+        if cls._concurrency <= 0:
+            yield
+            return
+
+        host = host_key(url)
+        with cls._slots_lock:
+            if host not in cls._slots:
+                cls._slots[host] = threading.BoundedSemaphore(cls._concurrency)
+            semaphore = cls._slots[host]
+        with semaphore:
+            yield
+
+    @classmethod
+    def interval(cls, host: str, cooldown: float, random_cooldown: float) -> float:
+        interval = cooldown + random.random() * random_cooldown
+        for domain, minimum in cls._intervals.items():
+            if host == domain or host.endswith(f".{domain}"):
+                interval = max(interval, minimum)
+        return interval
+
+    @classmethod
+    def reserve(cls, host: str, interval: float) -> float:
+        # Token bucket in its GCRA form: the shared state is one theoretical
+        # arrival time per host, so a reservation is a single read and write.
+        tolerance = (cls._burst - 1) * interval
+        with cls._lock:
+            now = time()
+            tat = cls._schedule.get(host, now)
+            start = max(now, tat - tolerance)
+            cls._schedule[host] = max(tat, start) + interval
+        return start - now
+
+    @classmethod
+    def wait(
+        cls, url: str, cooldown: float = 0.0, random_cooldown: float = 0.0
+    ) -> None:
+        host = host_key(url)
+        interval = cls.interval(host, cooldown, random_cooldown)
+        if interval <= 0.0:
+            return
+
+        delay = cls.reserve(host, interval)
+        if delay > 0.0:
+            Metrics.incr("limiter.waits")
+            sleep(delay)
@@ -1,37 +1,145 @@
 import re
-from typing import Optional
+from typing import Any, Optional
+from urllib.parse import urlsplit
 
-from bs4 import Tag
+from lxml import etree
+from lxml.html import HtmlElement
 
+from pp_crawler.core.extraction import BrowserTemplate
 from pp_crawler.core.functions import get_logger
+from pp_crawler.core.parsing import text
 
+MAX_LABEL_LENGTH = 80
+LINKS_PATH = "descendant::a[@href]"
+LABEL_FILTER = (
+    "[string-length(normalize-space()) > 0"
+    f" and string-length(normalize-space()) <= {MAX_LABEL_LENGTH}]"
+)
+ANCHORS_PATH = f"{LINKS_PATH}{LABEL_FILTER}"
+FOOTER_PATH = (
+    "ancestor::*[self::footer"
+    ' or contains(@id, "footer") or contains(@class, "footer")]'
+)
+IN_FOOTER = etree.XPath(f"boolean({FOOTER_PATH})")
+WORD_RE = re.compile(r"^\w+$")
 
-def compile_patterns(patterns: list[str]) -> list[re.Pattern[str]]:
-    return [re.compile(p.replace(" ", ".*"), re.IGNORECASE) for p in patterns]
+Score = tuple[int, bool, bool, int]
+
+
+def compile_patterns(patterns: list[str]) -> re.Pattern[str]:
+    alternatives = (f"(?P<p{i}>{p.replace(' ', '.*')})" for i, p in enumerate(patterns))
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+
+def pattern_prefixes(patterns: list[str]) -> Optional[tuple[str, ...]]:
+    prefixes = []
+    for pattern in patterns:
+        head = pattern.split(" ", 1)[0].lower()
+        if not WORD_RE.match(head):
+            return None
+        prefixes.append(head)
+    return tuple(prefixes)
+
+
+def anchors_path(prefixes: Optional[tuple[str, ...]]) -> str:
+    if not prefixes:
+        return ANCHORS_PATH
+
+    initials = {c for p in prefixes for c in (p[0], p[0].upper()) if len(c) == 1}
+    first = "".join(sorted(initials))
+    initial = f'contains("{first}", substring(normalize-space(), 1, 1))'
+    return f"{LINKS_PATH}[{initial}]{LABEL_FILTER}"
+
+
+def site_of(url: str) -> str:
+    host = urlsplit(url if "//" in url else f"//{url}").hostname or ""
+    return host.removeprefix("www.")
 
 
 class LinkMatcher:
     def __init__(self, privacy_links: list[str]):
         self.logger = get_logger()
-        self.regexes = compile_patterns(privacy_links)
+        self.patterns = privacy_links
+        self.regex = compile_patterns(privacy_links)
+        self.prefixes = pattern_prefixes(privacy_links)
+        self.anchors_path = anchors_path(self.prefixes)
+        self._anchors = etree.XPath(self.anchors_path)
+        self.head_length = max(map(len, self.prefixes or ("",)))
         self.href_re = re.compile(r"^((https?://)?(www\.)?([\w.\-_]+)\.\w+)?(.*$)")
         self.http_re = re.compile(r"https?:(//)?")
 
-    def match(self, website: str, body: Tag) -> Optional[str]:
-        for link in reversed(body.find_all("a")):
-            if not isinstance(link, Tag):
-                continue
+    def __reduce__(self) -> tuple[Any, ...]:
+        return LinkMatcher, (self.patterns,)
 
-            text = link.text.lower().strip()
-            if not any(r.match(text) for r in self.regexes):
-                return None
+    def template(self, website: str) -> "PolicyTemplate":
+        return PolicyTemplate(self, website)
 
-            href = link.get("href")
-            if not isinstance(href, str):
+    def rank(self, label: str) -> Optional[int]:
+        if self.prefixes is not None:
+            head = label.lstrip()[: self.head_length].lower()
+            if not head.startswith(self.prefixes):
                 return None
 
-            if ref := self.href_re.match(href):
-                cleaned_url = self.http_re.sub("", website)
-                return f"http://{cleaned_url}{ref.group(5)}"
+        label = " ".join(label.split()).lower()
+        if len(label) > MAX_LABEL_LENGTH:
+            return None
+        if m := self.regex.match(label):
+            return next(int(k[1:]) for k, v in m.groupdict().items() if v is not None)
+        return None
 
+    def match(self, website: str, body: HtmlElement) -> Optional[str]:
+        anchors = []
+        for a in self._anchors(body):
+            label = text(a)
+            if self.rank(label) is not None:
+                anchors.append((label, a.get("href"), bool(IN_FOOTER(a))))
+        return self.match_anchors(website, anchors)
+
+    def match_anchors(
+        self, website: str, anchors: list[tuple[str, Optional[str], bool]]
+    ) -> Optional[str]:
+        site = site_of(self.http_re.sub("", website))
+        best: Optional[tuple[Score, str]] = None
+        for position in range(len(anchors) - 1, -1, -1):
+            label, href, footer = anchors[position]
+            if href is None or (rank := self.rank(label)) is None:
+                continue
+
+            score = self.score(site, rank, footer, href, position)
+            if best is None or score > best[0]:
+                best = score, href
+            if score[:3] == (0, True, True):
+                break
+
+        return self.resolve(website, best[1] if best else None)
+
+    def score(
+        self, site: str, rank: int, footer: bool, href: str, position: int
+    ) -> Score:
+        same_site = not urlsplit(href).netloc or site_of(href) == site
+        return -rank, footer, same_site, position
+
+    def resolve(self, website: str, href: Optional[str]) -> Optional[str]:
+        if href is not None and (ref := self.href_re.match(href)):
+            cleaned_url = self.http_re.sub("", website)
+            return f"http://{cleaned_url}{ref.group(5)}"
         return None
+
+
+class PolicyTemplate(BrowserTemplate[Optional[str]]):
+    def __init__(self, matcher: LinkMatcher, website: str):
+        self.matcher = matcher
+        self.website = website
+
+    def program(self) -> dict[str, Any]:
+        return {
+            "kind": "anchors",
+            "path": self.matcher.anchors_path,
+            "footer": FOOTER_PATH,
+        }
+
+    def from_data(self, data: Any) -> Optional[str]:
+        return self.matcher.match_anchors(self.website, data or [])
+
+    def __call__(self, body: HtmlElement) -> Optional[str]:
+        return self.matcher.match(self.website, body)
@@ -0,0 +1,106 @@
+import threading
+from contextlib import contextmanager
+from time import sleep
+from typing import Any, Callable, Iterator, Optional
+
+import psutil
+
+from pp_crawler.core.config import MemoryConfig
+from pp_crawler.core.metrics import Metrics
+
+MB = 1024 * 1024
+
+
+def tree_rss(pid: int) -> int:
+    try:
+        root = psutil.Process(pid)
+        processes = [root, *root.children(recursive=True)]
+    except psutil.Error:
+        return 0
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+class MemoryGovernor(threading.Thread):
+    def __init__(self, conf: MemoryConfig, allowed: Any, maximum: int):
+        from pp_crawler.core.functions import get_logger
+
+        super().__init__(name="memory-governor", daemon=True)
+        self.logger = get_logger()
+        self._conf = conf
+        self._allowed = allowed
+        self._maximum = maximum
+        self._minimum = max(1, min(conf.min_workers, maximum))
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(self._conf.interval):
+            self.step(psutil.virtual_memory().percent)
+
+    def step(self, percent: float) -> None:
+        allowed = self._allowed.value
+        if percent >= self._conf.high_watermark and allowed > self._minimum:
+            allowed -= 1
+        elif percent < self._conf.low_watermark and allowed < self._maximum:
+            allowed += 1
+        else:
+            return
+
+        self._allowed.value = allowed
+        self.logger.info(f"Memory at {percent:.0f}%, allowing {allowed} browsers")
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+class MemorySlots:
+    _allowed: Any = None
+    _active: Any = None
+    _lock: Any = None
+    _poll: float = 1.0
+
+    @classmethod
+    def set_state(cls, allowed: Any, active: Any, lock: Any, poll: float) -> None:
+        cls._allowed = allowed
+        cls._active = active
+        cls._lock = lock
+        cls._poll = poll
+
+    @classmethod
+    def try_acquire(cls) -> bool:
+        with cls._lock:
+            if cls._active.value >= cls._allowed.value:
+                return False
+            cls._active.value += 1
+            return True
+
+    @classmethod
+    def release(cls) -> None:
+        with cls._lock:
+            cls._active.value -= 1
+
+    @classmethod
+    @contextmanager
+    def acquire(cls, on_wait: Optional[Callable[[], None]] = None) -> Iterator[None]:
+        if cls._lock is None:
+            yield
+            return
+
+        if not cls.try_acquire():
+            Metrics.incr("memory.throttled")
+            if on_wait:
+                on_wait()
+            while not cls.try_acquire():
+                sleep(cls._poll)
+
+        try:
+            yield
+        finally:
+            cls.release()
@@ -0,0 +1,22 @@
+import threading
+from collections import Counter
+
+
+class Metrics:
+    _counters: Counter[str] = Counter()
+    _lock = threading.Lock()
+
+    @classmethod
+    def incr(cls, name: str, value: int = 1) -> None:
+        with cls._lock:
+            cls._counters[name] += value
+
+    @classmethod
+    def get(cls, name: str) -> int:
+        return cls._counters[name]
+
+    @classmethod
+    def summary(cls) -> str:
+        with cls._lock:
+            counters = sorted(cls._counters.items())
+        return ", ".join(f"{k}={v}" for k, v in counters)
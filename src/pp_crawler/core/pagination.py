@@ -0,0 +1,102 @@
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from pp_crawler.core.config import PaginationConfig
+from pp_crawler.core.dispatch import Dispatcher
+from pp_crawler.core.executor import Executor
+from pp_crawler.core.functions import get_logger
+from pp_crawler.core.metrics import Metrics
+
+
+class Paginator:
+    _config: PaginationConfig = PaginationConfig()
+
+    @classmethod
+    def set_config(cls, config: PaginationConfig) -> None:
+        cls._config = config
+
+    def __init__(
+        self,
+        template: str,
+        keywords: list[Optional[str]],
+        pages: int,
+        done: Iterable[str] = (),
+    ):
+        self.template = template
+        self._done = set(done)
+        self._keywords = deque(dict.fromkeys(keywords))
+        self._budget = {k: pages for k in self._keywords}
+        self._next = {k: 1 for k in self._keywords}
+        self._dry = {k: 0 for k in self._keywords}
+        self._in_flight = {k: 0 for k in self._keywords}
+        self._pages: dict[str, tuple[Optional[str], int]] = {}
+
+    def next(self) -> Optional[tuple[str, Optional[str]]]:
+        for _ in range(len(self._keywords)):
+            keyword = self._keywords[0]
+            self._keywords.rotate(-1)
+            if self._in_flight[keyword] >= max(1, self._config.lookahead):
+                continue
+
+            while self._next[keyword] <= self._budget[keyword]:
+                page = self._next[keyword]
+                self._next[keyword] += 1
+                url = self.template.format(keyword=keyword, page=page)
+                if url in self._done:
+                    continue
+
+                self._in_flight[keyword] += 1
+                self._pages[url] = (keyword, page)
+                return url, keyword
+
+        return None
+
+    def feedback(self, url: str, new: Optional[int]) -> None:
+        if url not in self._pages:
+            return
+
+        keyword, page = self._pages.pop(url)
+        self._in_flight[keyword] -= 1
+        if new is None:
+            Metrics.incr("pagination.failed")
+            return
+
+        Metrics.incr("pagination.pages")
+
+        if new < self._config.min_new:
+            self._dry[keyword] += 1
+            if self._dry[keyword] >= max(1, self._config.patience):
+                if self._budget[keyword] >= self._next[keyword]:
+                    get_logger().info(f"Keyword {keyword} exhausted at page {page}")
+                    Metrics.incr("pagination.exhausted")
+                self._budget[keyword] = min(self._budget[keyword], page)
+            return
+
+        self._dry[keyword] = 0
+        extend = self._config.extend_new
+        if extend and new >= extend and page >= self._budget[keyword]:
+            limit = self._config.max_pages
+            if not limit or page < limit:
+                self._budget[keyword] = page + 1
+                Metrics.incr("pagination.extended")
+
+
+def paginate(
+    pool: Executor,
+    func: Callable[[tuple[str, Optional[str]]], Any],
+    paginator: Paginator,
+    size: int = 64,
+    name: str = "search",
+) -> Iterator[Any]:
+    dispatcher = Dispatcher(pool, func, size)
+
+    while True:
+        while not dispatcher.full() and (task := paginator.next()):
+            dispatcher.submit(task[0], task)
+        if not dispatcher.in_flight:
+            break
+
+        if done := dispatcher.next():
+            yield done[1]
+
+    dispatcher.report(name)
@@ -0,0 +1,35 @@
+import threading
+from typing import Optional
+
+from lxml import etree, html
+from lxml.html import HtmlElement
+
+_local = threading.local()
+
+
+def _parser() -> html.HTMLParser:
+    if (p := getattr(_local, "parser", None)) is None:
+        p = _local.parser = html.HTMLParser(encoding="utf-8")
+    return p
+
+
+def parse_body(markup: str) -> Optional[HtmlElement]:
+    if not markup:
+        return None
+    try:
+        root = html.document_fromstring(markup.encode("utf-8"), parser=_parser())
+    except (etree.ParserError, ValueError):
+        return None
+    return root.find("body")
+
+
+def has_class(name: str) -> str:
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+def text(node: HtmlElement) -> str:
+    return str(node.text_content())
+
+
+def attributes(nodes: list[str]) -> list[str]:
+    return [str(n) for n in nodes]
@@ -3,12 +3,53 @@ import logging
 import logging.handlers
 import signal
 import sys
+import threading
+from dataclasses import dataclass, replace
+from multiprocessing.managers import SyncManager
 from multiprocessing.queues import Queue
-from typing import Any
+from multiprocessing.sharedctypes import RawValue
+from typing import Any, MutableMapping
 
-from pp_crawler.core.config import DriverConfig
+from selenium.common.exceptions import WebDriverException
+
+from pp_crawler.core.config import Config
 from pp_crawler.core.functions import get_logger
+from pp_crawler.core.limiter import HostLimiter
+from pp_crawler.core.memory import MemorySlots
+from pp_crawler.core.metrics import Metrics
+from pp_crawler.crawler.web.cache import PageCache
+from pp_crawler.crawler.web.client import Client
 from pp_crawler.crawler.web.driver import Driver
+from pp_crawler.crawler.web.fetcher import Fetcher
+
+
+@dataclass
+class SharedState:
+    schedule: MutableMapping[str, float]
+    schedule_lock: Any
+    allowed: Any
+    active: Any
+    slots_lock: Any
+
+    @staticmethod
+    def build(manager: SyncManager, proc_count: int) -> "SharedState":
+        return SharedState(
+            schedule=manager.dict(),
+            schedule_lock=manager.Lock(),
+            allowed=manager.Value("i", proc_count),
+            active=manager.Value("i", 0),
+            slots_lock=manager.Lock(),
+        )
+
+    @staticmethod
+    def local(proc_count: int) -> "SharedState":
+        return SharedState(
+            schedule={},
+            schedule_lock=threading.Lock(),
+            allowed=RawValue("i", proc_count),
+            active=RawValue("i", 0),
+            slots_lock=threading.Lock(),
+        )
 
 
 class ExitFilter(logging.Filter):
@@ -34,16 +75,65 @@ def init_logger(queue: Queue[Any]) -> None:
     root.addHandler(h)
 
 
-def worker_constructor(queue: Queue[Any], config: "DriverConfig") -> None:
+def worker_constructor(
+    queue: Queue[Any],
+    config: "Config",
+    state: SharedState,
+) -> None:
     signal.signal(signal.SIGINT, signal.SIG_IGN)
     signal.signal(signal.SIGTERM, sysexit)
     atexit.register(worker_destructor)
     init_logger(queue)
-    Driver.set_config(config)
+    configure_fetching(config, state.schedule, state.schedule_lock)
+    if config.memory.enabled:
+        MemorySlots.set_state(
+            state.allowed, state.active, state.slots_lock, config.memory.poll
+        )
+    if config.driver.prewarm and not config.cache.replay:
+        try:
+            with Driver.session():
+                pass
+        except (WebDriverException, OSError) as e:
+            get_logger().warning(f"Driver pre-warm failed, starting lazily: {e}")
+
+
+def async_constructor(config: "Config", state: SharedState) -> None:
+    size = config.fetch.host_concurrency or config.concurrency
+    fetch = replace(config.fetch, pool_maxsize=max(config.fetch.pool_maxsize, size))
+    configure_fetching(
+        replace(config, fetch=fetch), state.schedule, state.schedule_lock
+    )
+    if config.memory.enabled:
+        MemorySlots.set_state(
+            state.allowed, state.active, state.slots_lock, config.memory.poll
+        )
+    Driver.set_sessions(config.proc_count)
+
+
+def configure_fetching(
+    config: "Config", schedule: MutableMapping[str, float], lock: Any
+) -> None:
+    Driver.set_config(config.driver)
+    Client.set_config(config.fetch, config.driver.user_agents)
+    Fetcher.set_config(config.fetch)
+    PageCache.set_config(config.cache, config.path.cache_path)
+    HostLimiter.set_state(
+        schedule,
+        lock,
+        config.fetch.host_burst,
+        config.fetch.host_intervals,
+        config.fetch.host_concurrency,
+    )
 
 
 def worker_destructor() -> None:
+    get_logger().info(f"Worker stats: {Metrics.summary()}")
     Driver.close()
+    Client.close()
+
+
+def manager_initializer() -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
 
 
 def logger_initializer(queue: Queue[Any]) -> None:
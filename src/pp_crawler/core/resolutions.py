@@ -0,0 +1,105 @@
+import sqlite3
+import threading
+from pathlib import Path
+from time import time
+from typing import Optional
+
+from pp_crawler.core.config import ResolutionConfig
+from pp_crawler.core.metrics import Metrics
+
+MISSING = object()
+
+
+class ResolutionCache:
+    _config: ResolutionConfig = ResolutionConfig()
+    _path: Optional[Path] = None
+    _conn: Optional[sqlite3.Connection] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def set_config(cls, config: ResolutionConfig, path: Path) -> None:
+        cls.close()
+        cls._config = config
+        cls._path = path
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return cls._config.enabled and cls._path is not None
+
+    @classmethod
+    def connection(cls) -> sqlite3.Connection:
+        if cls._conn:
+            return cls._conn
+        if cls._path is None:
+            raise ValueError("Config is not set!")
+
+        cls._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(cls._path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS resolutions ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT,"
+            " stored_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        conn.commit()
+        cls._conn = conn
+        return conn
+
+    @classmethod
+    def ttl(cls, namespace: str, value: Optional[str]) -> float:
+        if value is None:
+            return cls._config.negative_ttl
+        return cls._config.ttl.get(namespace, cls._config.default_ttl)
+
+    @classmethod
+    def get(cls, namespace: str, key: str) -> object:
+        if not cls.enabled():
+            return MISSING
+
+        with cls._lock:
+            row = (
+                cls.connection()
+                .execute(
+                    "SELECT value, stored_at FROM resolutions"
+                    " WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                )
+                .fetchone()
+            )
+        if not row:
+            Metrics.incr(f"resolution.{namespace}.miss")
+            return MISSING
+
+        value, stored_at = row
+        if time() - stored_at > cls.ttl(namespace, value):
+            Metrics.incr(f"resolution.{namespace}.expired")
+            return MISSING
+
+        outcome = "hit" if value is not None else "negative"
+        Metrics.incr(f"resolution.{namespace}.{outcome}")
+        return value
+
+    @classmethod
+    def put(cls, namespace: str, key: str, value: Optional[str]) -> None:
+        if not cls.enabled():
+            return
+
+        with cls._lock:
+            conn = cls.connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO resolutions (namespace, key, value, stored_at)"
+                " VALUES (?, ?, ?, ?)",
+                (namespace, key, value, time()),
+            )
+            conn.commit()
+
+    @classmethod
+    def close(cls) -> None:
+        with cls._lock:
+            if cls._conn:
+                cls._conn.close()
+                cls._conn = None
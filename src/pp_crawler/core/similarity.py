@@ -0,0 +1,138 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional
+
+HOST_RE = re.compile(r"^\s*(?:[a-z][a-z\d+.\-]*:)?(?://)?([^\s/?#:›]+)", re.IGNORECASE)
+TOKEN_RE = re.compile(r"[^\W_]+")
+NAME_NOISE = frozenset(
+    {
+        "co",
+        "company",
+        "corp",
+        "corporation",
+        "gmbh",
+        "group",
+        "inc",
+        "international",
+        "limited",
+        "llc",
+        "ltd",
+        "the",
+    }
+)
+SECOND_LEVEL = frozenset(
+    {"ac", "co", "com", "edu", "go", "gov", "ne", "net", "or", "org"}
+)
+
+MIN_CONTAINED = 3
+
+Grams = frozenset[str]
+
+
+@dataclass(frozen=True)
+class Candidate:
+    url: str
+    host: str
+    label: str
+    score: float
+    position: int
+
+
+def grams(word: str) -> Grams:
+    padded = f" {word} "
+    return frozenset(padded[i : i + 2] for i in range(len(padded) - 1))
+
+
+def dice(a: Grams, b: Grams) -> float:
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def contains(a: str, b: str) -> float:
+    short, long = sorted((a, b), key=len)
+    if len(short) < MIN_CONTAINED or short not in long:
+        return 0.0
+    return 0.5 + 0.5 * len(short) / len(long)
+
+
+def decode_host(host: str) -> str:
+    host = host.lower().strip(".")
+    if "xn--" in host:
+        try:
+            return host.encode("ascii").decode("idna")
+        except UnicodeError:
+            return host
+    return host
+
+
+def site_label(host: str) -> str:
+    labels = host.removeprefix("www.").split(".")
+    if len(labels) > 2 and labels[-2] in SECOND_LEVEL and len(labels[-1]) == 2:
+        labels = labels[:-2]
+    elif len(labels) > 1:
+        labels = labels[:-1]
+    return labels[-1].replace("-", "")
+
+
+@lru_cache(maxsize=4096)
+def name_tokens(name: str) -> tuple[tuple[str, Grams], ...]:
+    tokens = TOKEN_RE.findall(unicodedata.normalize("NFKC", name).lower())
+    tokens = [t for t in tokens if t not in NAME_NOISE] or tokens
+    if len(tokens) > 1:
+        tokens.append("".join(tokens))
+    return tuple((t, grams(t)) for t in dict.fromkeys(tokens))
+
+
+@lru_cache(maxsize=65536)
+def domain_of(cite: str) -> Optional[tuple[str, str, Grams]]:
+    if not (m := HOST_RE.match(cite)):
+        return None
+    host = decode_host(m.group(1))
+    if "." not in host:
+        return None
+    label = site_label(host)
+    return host, label, grams(label)
+
+
+class SimilarityScorer:
+    def __init__(self, threshold: float = 0.6):
+        self.threshold = threshold
+
+    def score(
+        self, tokens: tuple[tuple[str, Grams], ...], label: str, label_grams: Grams
+    ) -> float:
+        best = 0.0
+        for token, token_grams in tokens:
+            best = max(best, contains(token, label))
+            size = len(token_grams) + len(label_grams)
+            if 2 * min(len(token_grams), len(label_grams)) / size > best:
+                best = max(best, dice(token_grams, label_grams))
+        return best
+
+    def rank(self, manufacturer: str, cites: Iterable[str]) -> list[Candidate]:
+        tokens = name_tokens(manufacturer)
+        if not tokens:
+            return []
+
+        candidates = []
+        seen = set()
+        for position, cite in enumerate(cites):
+            domain = domain_of(cite)
+            if domain is None or domain[0] in seen:
+                continue
+            seen.add(domain[0])
+
+            host, label, label_grams = domain
+            score = self.score(tokens, label, label_grams)
+            if score >= self.threshold:
+                candidates.append(
+                    Candidate(f"http://{host}", host, label, score, position)
+                )
+
+        candidates.sort(key=lambda c: (-c.score, c.position))
+        return candidates
+
+    def best(self, manufacturer: str, cites: Iterable[str]) -> Optional[str]:
+        ranked = self.rank(manufacturer, cites)
+        return ranked[0].url if ranked else None
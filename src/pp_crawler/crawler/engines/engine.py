@@ -1,8 +1,44 @@
+import importlib
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Optional
+
+ENGINES: dict[str, type["Engine"]] = {}
+
+
+class SearchError(Exception):
+    pass
 
 
 class Engine(ABC):
+    name = ""
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.name:
+            ENGINES[cls.name] = cls
+
     @abstractmethod
     def search(self, manufacturer: str, keyword: str) -> Optional[str]:
         pass
+
+
+def build_engine(name: str, **kwargs: Any) -> Engine:
+    if name not in ENGINES:
+        module = f"pp_crawler.crawler.engines.{name}"
+        try:
+            importlib.import_module(module)
+        except ModuleNotFoundError as e:
+            if e.name != module:
+                raise
+    if name not in ENGINES:
+        raise ValueError(f"Unknown search engine: {name}")
+    return ENGINES[name](**kwargs)
+
+
+def build_engines(
+    specs: list[dict[str, Any]], defaults: dict[str, dict[str, Any]]
+) -> list[Engine]:
+    specs = specs or [{"name": name} for name in defaults]
+    return [
+        build_engine(**{**defaults.get(spec["name"], {}), **spec}) for spec in specs
+    ]
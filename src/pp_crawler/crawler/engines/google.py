@@ -1,72 +1,52 @@
-import re
-from difflib import SequenceMatcher
 from typing import Optional
+from urllib.parse import quote_plus
 
-from bs4 import BeautifulSoup, Tag
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support import expected_conditions as ec
+from pp_crawler.core.extraction import TextTemplate
+from pp_crawler.core.functions import extract_from_url
+from pp_crawler.core.similarity import Candidate, SimilarityScorer
+from pp_crawler.crawler.engines.engine import Engine, SearchError
+from pp_crawler.crawler.web.fetcher import BROWSER
 
-from pp_crawler.crawler.engines.engine import Engine
-from pp_crawler.crawler.web.driver import Driver
+SEARCH_URL = "https://www.google.com/search?q={query}&num={results}"
+CITES = TextTemplate("descendant::cite")
 
 
 class GoogleEngine(Engine):
+    name = "google"
+
     def __init__(
         self,
         similarity_threshold: float = 0.6,
         cooldown: float = 0.0,
         random_cooldown: float = 0.0,
+        results: int = 10,
     ):
         super().__init__()
         self.cooldown = cooldown
         self.random_cooldown = random_cooldown
-        self.similarity = similarity_threshold
-        self.regex_href = re.compile(r"^((https?://)?(www\.)?([\w.\-_]+)(\.\w+)).*$")
-        self.regex_request = re.compile(r"[^\w ]+|\s{2,}")
-
-    def search(self, manufacturer: str, keyword: str) -> Optional[str]:
-        driver = Driver.spawn()
-        driver.get("https://www.google.com")
-
-        search = driver.find_element(By.NAME, "q")
-        search.send_keys(f"{manufacturer} {keyword}", Keys.RETURN)
-
-        driver.wait(ec.presence_of_element_located((By.TAG_NAME, "cite")))
-
-        markup = driver.source()
-        if not markup:
-            return None
-
-        body = BeautifulSoup(markup, "lxml").find("body")
-        if not isinstance(body, Tag):
-            return None
+        self.results = results
+        self.scorer = SimilarityScorer(similarity_threshold)
 
-        return self.similarity_filter(manufacturer, body, threshold=self.similarity)
+    def search_url(self, manufacturer: str, keyword: str) -> str:
+        query = " ".join(f"{manufacturer} {keyword}".lower().split())
+        return SEARCH_URL.format(query=quote_plus(query), results=self.results)
 
-    def similarity_filter(
-        self, content: str, body: Tag, threshold: float = 0.6
-    ) -> Optional[str]:
-        best_url = None
-        best_similarity = threshold
-
-        content_list = self.regex_request.sub(" ", content).split()
-        if len(content_list) > 1:
-            content_list.append("".join(content_list))
-
-        for cite in body.find_all("cite"):
-            m = self.regex_href.match(cite.text)
-            if not m:
-                break
-
-            domain = m.group(4)
-            for piece in content_list:
-                sim = SequenceMatcher(None, piece, domain).ratio()
-                if not (sim <= best_similarity and domain not in piece):
-                    return best_url
-
-                w3 = m.group(3) or ""
-                best_url = f"http://{w3}{domain}{m.group(5)}"
-                best_similarity = sim
-
-        return best_url
+    def search(self, manufacturer: str, keyword: str) -> Optional[str]:
+        url = self.search_url(manufacturer, keyword)
+        cites = extract_from_url(
+            url,
+            CITES,
+            self.cooldown,
+            self.random_cooldown,
+            mode=BROWSER,
+            stage="serp",
+            ready="cite",
+        )
+        if cites is None:
+            raise SearchError(f"No search results at {url}")
+
+        ranked = self.similarity_filter(manufacturer, cites)
+        return ranked[0].url if ranked else None
+
+    def similarity_filter(self, manufacturer: str, cites: list[str]) -> list[Candidate]:
+        return self.scorer.rank(manufacturer, cites)
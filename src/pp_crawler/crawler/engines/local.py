@@ -0,0 +1,23 @@
+import json
+from pathlib import Path
+from typing import Optional, Union
+
+from pp_crawler.crawler.engines.engine import Engine
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+class LocalEngine(Engine):
+    name = "local"
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, encoding="utf-8") as f:
+            sites = json.load(f)
+        self.sites = {normalize_name(k): v for k, v in sites.items() if v}
+
+    def search(self, manufacturer: str, keyword: str) -> Optional[str]:
+        site = self.sites.get(normalize_name(manufacturer))
+        return str(site) if site else None
@@ -1,3 +1,4 @@
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import ClassVar, Optional
@@ -6,17 +7,24 @@ from typing import ClassVar, Optional
 @dataclass
 class Item(ABC):
     _counter: ClassVar[int] = 0
+    _lock: ClassVar[threading.Lock] = threading.Lock()
 
     id: Optional[int] = None
     page: Optional[str] = None
 
     def __post_init__(self) -> None:
         cls = self.__class__
-        if self.id is None:
-            self.id = cls._counter
-            cls._counter += 1
-        else:
-            cls._counter = max(cls._counter, self.id + 1)
+        with Item._lock:
+            if self.id is None:
+                self.id = cls._counter
+                cls._counter += 1
+            else:
+                cls._counter = max(cls._counter, self.id + 1)
+
+    @classmethod
+    def reserve_ids(cls, start: int) -> None:
+        with Item._lock:
+            cls._counter = max(cls._counter, start)
 
     @abstractmethod
     def __hash__(self) -> int:
@@ -1,37 +1,40 @@
 from functools import partial
 from hashlib import md5
-from multiprocessing.pool import Pool
 from pathlib import Path
-from typing import Optional, Type
+from typing import Any, Callable, Iterator, Optional, Type, cast
 
 from bs4 import BeautifulSoup, Tag
 
+from pp_crawler.core.executor import Executor
 from pp_crawler.core.functions import (
-    chunked,
     concat_files,
     get_logger,
-    load_last_id_page,
     read_models,
-    skip_to,
     temp_descriptor,
-    write_models,
 )
+from pp_crawler.core.resolutions import MISSING
 from pp_crawler.crawler.item import Item
-from pp_crawler.crawler.modules.module import Module
-from pp_crawler.crawler.web.driver import Driver
-
-
-def download_and_hash(policy: str, html_dir: Path) -> tuple[str, Optional[str]]:
-    driver = Driver.spawn()
-    driver.get(policy, remove_invisible=True)
-
-    markup = driver.source()
-    if not markup:
-        return policy, None
+from pp_crawler.crawler.modules.resolver import Resolution, Resolver
+from pp_crawler.crawler.web.driver import BODY_STABLE
+from pp_crawler.crawler.web.fetcher import Fetcher
+
+
+def download_and_hash(
+    policy: str, html_dir: Path, resources: Optional[dict[str, Any]] = None
+) -> Resolution:
+    page = Fetcher.fetch(
+        policy,
+        remove_invisible=True,
+        stage="policy",
+        resources=resources,
+        ready=BODY_STABLE,
+    )
+    if not page:
+        return policy, None, False
 
-    body = BeautifulSoup(markup, "lxml").find("body")
+    body = BeautifulSoup(page.markup, "lxml").find("body")
     if not isinstance(body, Tag):
-        return policy, None
+        return policy, None, True
 
     pretty_body = body.prettify()
 
@@ -53,10 +56,13 @@ def download_and_hash(policy: str, html_dir: Path) -> tuple[str, Optional[str]]:
         f.write(content)
 
     get_logger().info(f"Downloaded policy: {policy}")
-    return policy, content_hash
+    return policy, content_hash, True
 
 
-class Downloader(Module):
+class Downloader(Resolver):
+    title = "Downloading policies"
+    namespace = "hash"
+
     def __init__(
         self,
         cls: Type[Item],
@@ -64,41 +70,45 @@ class Downloader(Module):
         explicit: Path,
         html: Path,
         chunk_size: int = 64,
+        resources: Optional[dict[str, Any]] = None,
     ):
-        self.cls = cls
-        self.descriptor = descriptor
+        super().__init__(cls, descriptor, chunk_size)
         self.explicit = explicit
         self.html = html
-        self.chunk_size = chunk_size
-
-    def run(self, pool: Pool) -> None:
-        get_logger().info("Downloading policies")
-
-        tmp1 = temp_descriptor(self.descriptor, self.__class__.__name__, "combined")
-        tmp2 = temp_descriptor(self.descriptor, self.__class__.__name__, "cache")
-        tmp3 = temp_descriptor(self.descriptor, self.__class__.__name__, "tmp")
-
-        worker_func = partial(download_and_hash, html_dir=self.html)
-
-        concat_files([self.descriptor, self.explicit], tmp1)
-        last_id, _ = load_last_id_page(tmp2)
-
-        models_iter = read_models(tmp1, self.cls)
-        skipped_iter = skip_to(models_iter, last_id, lambda x: x.id)
-
-        p_cache = dict()
-        for models in chunked(skipped_iter, self.chunk_size):
-            new_policies = [
-                m.policy for m in models if m.policy and m.policy not in p_cache
-            ]
-
-            for policy, content_hash in pool.imap(worker_func, new_policies):
-                p_cache[policy] = content_hash
-
-            for m in models:
-                m.hash = p_cache.get(m.policy, None)
-
-            write_models(tmp2, models, mode="a")
-
-        concat_files([tmp2], tmp3)
-        tmp3.replace(self.descriptor)
+        self.resources = resources
+        self._combined: Optional[Path] = None
+
+    def key(self, model: Any) -> Optional[str]:
+        return cast(Optional[str], model.policy)
+
+    def worker(self) -> Callable[[Any], Resolution]:
+        return partial(download_and_hash, html_dir=self.html, resources=self.resources)
+
+    def apply(self, model: Any, value: Optional[str]) -> None:
+        model.hash = value
+
+    def lookup(self, key: str) -> object:
+        value = super().lookup(key)
+        if isinstance(value, str) and not (self.html / f"{value}.html").exists():
+            return MISSING
+        return value
+
+    def records(self) -> Iterator[Item]:
+        if self._combined is None:
+            self._combined = temp_descriptor(
+                self.descriptor, self.__class__.__name__, "combined"
+            )
+            concat_files([self.descriptor, self.explicit], self._combined)
+        return read_models(self._combined, self.cls)
+
+    def run(self, pool: Executor) -> None:
+        self._combined = None
+        try:
+            super().run(pool)
+        finally:
+            if self._combined is not None:
+                self._combined.unlink(missing_ok=True)
+                self._combined = None
+
+    def sources(self) -> list[Iterator[Item]]:
+        return [read_models(self.explicit, self.cls)]
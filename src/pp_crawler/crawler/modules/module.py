@@ -1,8 +1,15 @@
 from abc import ABC, abstractmethod
-from multiprocessing.pool import Pool
+from typing import Iterator
+
+from pp_crawler.core.executor import Executor
+from pp_crawler.crawler.item import Item
 
 
 class Module(ABC):
     @abstractmethod
-    def run(self, pool: Pool) -> None:
+    def run(self, pool: Executor) -> None:
         pass
+
+    def stream(self, pool: Executor) -> Iterator[Item]:
+        self.run(pool)
+        return iter(())
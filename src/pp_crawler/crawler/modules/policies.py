@@ -1,22 +1,13 @@
 from functools import partial
-from multiprocessing.pool import Pool
 from pathlib import Path
-from typing import Optional, TypeVar
+from typing import Any, Callable, Optional, TypeVar, cast
 
-from pp_crawler.core.functions import (
-    chunked,
-    concat_files,
-    get_logger,
-    get_soup_from_url,
-    load_last_id_page,
-    read_models,
-    skip_to,
-    temp_descriptor,
-    write_models,
-)
+from pp_crawler.core.functions import extract_page, get_logger, program_of
 from pp_crawler.core.link_matcher import LinkMatcher
 from pp_crawler.crawler.item import Item
-from pp_crawler.crawler.modules.module import Module
+from pp_crawler.crawler.modules.resolver import Resolution, Resolver
+from pp_crawler.crawler.web.driver import BODY_STABLE
+from pp_crawler.crawler.web.fetcher import Fetcher
 
 T = TypeVar("T", bound=Item)
 
@@ -26,19 +17,30 @@ def find_policy(
     link_matcher: LinkMatcher,
     cooldown: float = 0.0,
     random_cooldown: float = 0.0,
-) -> tuple[str, Optional[str]]:
-    soup = get_soup_from_url(url, cooldown, random_cooldown)
-    if not soup:
-        return url, None
-
-    if policy := link_matcher.match(url, soup):
+) -> Resolution:
+    template = link_matcher.template(url)
+    page = Fetcher.fetch(
+        url,
+        cooldown,
+        random_cooldown,
+        stage="homepage",
+        ready=BODY_STABLE,
+        program=program_of(template),
+    )
+    if not page:
+        return url, None, False
+
+    if policy := extract_page(page, template):
         get_logger().info(f"Found policy: {policy}")
-        return url, policy
+        return url, policy, True
+
+    return url, None, True
 
-    return url, None
 
+class Policies(Resolver):
+    title = "Searching policies"
+    namespace = "policy"
 
-class Policies(Module):
     def __init__(
         self,
         cls: type[T],
@@ -48,44 +50,21 @@ class Policies(Module):
         random_cooldown: float = 0.0,
         chunk_size: int = 64,
     ):
-        self.cls = cls
-        self.descriptor = descriptor
+        super().__init__(cls, descriptor, chunk_size)
         self.link_matcher = link_matcher
         self.cooldown = cooldown
         self.random_cooldown = random_cooldown
-        self.chunk_size = chunk_size
-
-    def run(self, pool: Pool) -> None:
-        get_logger().info("Searching policies")
 
-        tmp1 = temp_descriptor(self.descriptor, self.__class__.__name__, "cache")
-        tmp2 = temp_descriptor(self.descriptor, self.__class__.__name__, "tmp")
+    def key(self, model: Any) -> Optional[str]:
+        return cast(Optional[str], model.website)
 
-        search_func = partial(
+    def worker(self) -> Callable[[Any], Resolution]:
+        return partial(
             find_policy,
             link_matcher=self.link_matcher,
             cooldown=self.cooldown,
             random_cooldown=self.random_cooldown,
         )
 
-        last_id, _ = load_last_id_page(tmp1)
-
-        models_iter = read_models(self.descriptor, self.cls)
-        skipped_iter = skip_to(models_iter, last_id, lambda x: x.id)
-
-        ws_cache = dict()
-        for models in chunked(skipped_iter, self.chunk_size):
-            new_websites = [
-                m.website for m in models if m.website and m.website not in ws_cache
-            ]
-
-            for website, policy in pool.imap(search_func, new_websites):
-                ws_cache[website] = policy
-
-            for m in models:
-                m.policy = ws_cache.get(m.website, None)
-
-            write_models(tmp1, models, mode="a")
-
-        concat_files([tmp1], tmp2)
-        tmp2.replace(self.descriptor)
+    def apply(self, model: Any, value: Optional[str]) -> None:
+        model.policy = value
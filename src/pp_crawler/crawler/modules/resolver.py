@@ -0,0 +1,109 @@
+from abc import abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, cast
+
+from pp_crawler.core.dispatch import Dispatcher
+from pp_crawler.core.executor import Executor
+from pp_crawler.core.functions import (
+    chunked,
+    get_logger,
+    read_models,
+    temp_descriptor,
+    write_models,
+)
+from pp_crawler.core.keyindex import KeyIndex
+from pp_crawler.core.resolutions import MISSING, ResolutionCache
+from pp_crawler.crawler.item import Item
+from pp_crawler.crawler.modules.module import Module
+
+Resolution = tuple[str, Optional[str], bool]
+
+
+class Resolver(Module):
+    title = "Resolving records"
+    namespace = "records"
+
+    def __init__(self, cls: type[Item], descriptor: Path, chunk_size: int = 64):
+        self.cls = cls
+        self.descriptor = descriptor
+        self.chunk_size = chunk_size
+
+    @abstractmethod
+    def key(self, model: Item) -> Optional[str]:
+        pass
+
+    def task(self, model: Item) -> Any:
+        return self.key(model)
+
+    @abstractmethod
+    def worker(self) -> Callable[[Any], Resolution]:
+        pass
+
+    @abstractmethod
+    def apply(self, model: Item, value: Optional[str]) -> None:
+        pass
+
+    def records(self) -> Iterator[Item]:
+        return read_models(self.descriptor, self.cls)
+
+    def sources(self) -> list[Iterator[Item]]:
+        return []
+
+    def lookup(self, key: str) -> object:
+        return ResolutionCache.get(self.namespace, key)
+
+    def remember(self, key: str, value: Optional[str]) -> None:
+        ResolutionCache.put(self.namespace, key, value)
+
+    def keys(self) -> Iterator[tuple[str, Any]]:
+        for m in self.records():
+            if key := self.key(m):
+                yield key, self.task(m)
+
+    def run(self, pool: Executor) -> None:
+        get_logger().info(self.title)
+
+        name = self.__class__.__name__
+        index = KeyIndex(temp_descriptor(self.descriptor, name, "keys", ".sqlite"))
+        tmp = temp_descriptor(self.descriptor, name, "tmp")
+
+        try:
+            unique = index.scan(self.keys())
+            done = index.resolved()
+            get_logger().info(f"{name}: {unique} unique keys, {done} already resolved")
+
+            dispatcher = Dispatcher(pool, self.worker(), self.chunk_size)
+            for key, task in index.pending():
+                if (value := self.lookup(key)) is not MISSING:
+                    index.resolve(key, cast(Optional[str], value))
+                    continue
+
+                while dispatcher.full():
+                    self.store(index, dispatcher, block=True)
+                dispatcher.submit(key, task)
+                self.store(index, dispatcher, block=False)
+
+            while dispatcher.in_flight:
+                self.store(index, dispatcher, block=True)
+            dispatcher.report(name.lower())
+
+            tmp.write_text("", encoding="utf-8")
+            for models in chunked(self.records(), self.chunk_size):
+                for m in models:
+                    ref = self.key(m)
+                    self.apply(m, index.get(ref) if ref else None)
+                write_models(tmp, models, mode="a")
+
+        finally:
+            index.close()
+
+        tmp.replace(self.descriptor)
+        index.remove()
+
+    def store(self, index: KeyIndex, dispatcher: Dispatcher, block: bool) -> None:
+        while done := dispatcher.next(block):
+            key, (_, value, fetched) = done
+            index.resolve(key, value)
+            if fetched:
+                self.remember(key, value)
+            block = False
@@ -0,0 +1,141 @@
+import queue
+import threading
+from functools import partial
+from itertools import chain
+from typing import Any, Iterable, Optional, cast
+
+from pp_crawler.core.executor import Executor
+from pp_crawler.core.functions import (
+    concat_files,
+    get_logger,
+    read_models,
+    temp_descriptor,
+)
+from pp_crawler.core.metrics import Metrics
+from pp_crawler.core.resolutions import MISSING
+from pp_crawler.crawler.item import Item
+from pp_crawler.crawler.modules.module import Module
+from pp_crawler.crawler.modules.resolver import Resolution, Resolver
+
+RECORD = "record"
+RESOLVED = "resolved"
+END = "end"
+FAILED = "failed"
+
+
+class Stream(Module):
+    def __init__(self, modules: list[Module], window: int = 256):
+        self.sources = [m for m in modules if not isinstance(m, Resolver)]
+        self.resolvers = [m for m in modules if isinstance(m, Resolver)]
+        self.window = max(1, window)
+
+        resolving = False
+        for m in modules:
+            if isinstance(m, Resolver):
+                resolving = True
+            elif resolving:
+                raise ValueError("Source modules must come before resolvers")
+        if not self.resolvers:
+            raise ValueError("Nothing to stream into")
+
+    def run(self, pool: Executor) -> None:
+        get_logger().info(
+            "Streaming records through " + ", ".join(r.title for r in self.resolvers)
+        )
+
+        descriptor = self.resolvers[0].descriptor
+        cls = self.resolvers[0].cls
+
+        snapshot = temp_descriptor(descriptor, self.__class__.__name__, "snapshot")
+        out = temp_descriptor(descriptor, self.__class__.__name__, "cache")
+        concat_files([descriptor], snapshot)
+        out.write_text("", encoding="utf-8")
+
+        sources: list[Iterable[Item]] = [
+            chain.from_iterable(m.stream(pool) for m in self.sources),
+            read_models(snapshot, cls),
+        ]
+        for resolver in self.resolvers:
+            sources.extend(resolver.sources())
+
+        self._events: queue.Queue[tuple[Any, ...]] = queue.Queue()
+        self._room = threading.Semaphore(self.window)
+        self._cache: list[dict[str, Optional[str]]] = [{} for _ in self.resolvers]
+        self._waiting: list[dict[str, list[Item]]] = [{} for _ in self.resolvers]
+        self._workers = [r.worker() for r in self.resolvers]
+        self._in_flight = 0
+
+        for source in sources:
+            threading.Thread(target=self._feed, args=(source,), daemon=True).start()
+
+        running = len(sources)
+        with out.open("a", encoding="utf-8") as sink:
+            self._sink = sink
+            while running or self._in_flight:
+                event = self._events.get()
+                if event[0] == RECORD:
+                    self._in_flight += 1
+                    self._advance(pool, 0, event[1])
+                elif event[0] == RESOLVED:
+                    _, stage, key, value, succeeded = event
+                    self._cache[stage][key] = value
+                    if succeeded:
+                        self.resolvers[stage].remember(key, value)
+                    for model in self._waiting[stage].pop(key, []):
+                        self.resolvers[stage].apply(model, value)
+                        self._advance(pool, stage + 1, model)
+                elif event[0] == END:
+                    running -= 1
+                elif event[0] == FAILED:
+                    raise event[1]
+
+        out.replace(descriptor)
+        snapshot.unlink(missing_ok=True)
+
+    def _feed(self, source: Iterable[Item]) -> None:
+        try:
+            for model in source:
+                self._room.acquire()
+                self._events.put((RECORD, model))
+        except Exception as e:
+            self._events.put((FAILED, e))
+        finally:
+            self._events.put((END,))
+
+    def _advance(self, pool: Executor, stage: int, model: Item) -> None:
+        while stage < len(self.resolvers):
+            resolver = self.resolvers[stage]
+            key = resolver.key(model)
+            if key and key in self._cache[stage]:
+                resolver.apply(model, self._cache[stage][key])
+            elif not key:
+                resolver.apply(model, None)
+            elif key in self._waiting[stage]:
+                self._waiting[stage][key].append(model)
+                return
+            elif (value := resolver.lookup(key)) is not MISSING:
+                self._cache[stage][key] = cast(Optional[str], value)
+                resolver.apply(model, self._cache[stage][key])
+            else:
+                self._waiting[stage][key] = [model]
+                pool.apply_async(
+                    self._workers[stage],
+                    (resolver.task(model),),
+                    callback=partial(self._resolved, stage, key),
+                    error_callback=partial(self._failed, stage, key),
+                )
+                return
+            stage += 1
+
+        self._sink.write(model.to_json() + "\n")
+        self._sink.flush()
+        self._in_flight -= 1
+        self._room.release()
+        Metrics.incr("stream.records")
+
+    def _resolved(self, stage: int, key: str, result: Resolution) -> None:
+        self._events.put((RESOLVED, stage, key, result[1], result[2]))
+
+    def _failed(self, stage: int, key: str, error: BaseException) -> None:
+        get_logger().warning(f"Resolving {key} failed: {error}")
+        self._events.put((RESOLVED, stage, key, None, False))
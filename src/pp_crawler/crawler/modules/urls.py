@@ -1,16 +1,56 @@
-from multiprocessing.pool import Pool
-from typing import TypeVar
+import queue
+import threading
+from typing import Any, Iterator, TypeVar
 
+from pp_crawler.core.executor import Executor
+from pp_crawler.core.functions import get_logger
+from pp_crawler.crawler.item import Item
 from pp_crawler.crawler.modules.module import Module
 from pp_crawler.crawler.plugins.plugin import Plugin
 
 T = TypeVar("T", bound=Plugin)
 
+DONE = object()
+
 
 class Urls(Module):
-    def __init__(self, plugins: list[T]) -> None:
+    def __init__(self, plugins: list[T], buffer_size: int = 1024) -> None:
         self.plugins = plugins
+        self.buffer_size = buffer_size
+
+    def run(self, pool: Executor) -> None:
+        for _ in self.stream(pool):
+            pass
+
+    def stream(self, pool: Executor) -> Iterator[Item]:
+        records: queue.Queue[Any] = queue.Queue(self.buffer_size)
+        for plugin in self.plugins:
+            threading.Thread(
+                target=self._drain,
+                args=(plugin, pool, records),
+                name=plugin.__class__.__name__,
+                daemon=True,
+            ).start()
+
+        running = len(self.plugins)
+        while running:
+            record = records.get()
+            if record is DONE:
+                running -= 1
+            elif isinstance(record, BaseException):
+                raise record
+            else:
+                yield record
 
-    def run(self, pool: Pool) -> None:
         for plugin in self.plugins:
-            plugin.scrap_records(pool)
+            plugin.commit_records()
+
+    def _drain(self, plugin: Plugin, pool: Executor, records: queue.Queue[Any]) -> None:
+        try:
+            for record in plugin.stream_records(pool):
+                records.put(record)
+        except Exception as e:
+            get_logger().exception(f"{plugin.__class__.__name__} failed")
+            records.put(e)
+        finally:
+            records.put(DONE)
@@ -1,40 +1,42 @@
 from functools import partial
-from multiprocessing.pool import Pool
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional, cast
 
-from pp_crawler.core.functions import (
-    chunked,
-    concat_files,
-    get_logger,
-    load_last_id_page,
-    read_models,
-    skip_to,
-    temp_descriptor,
-    write_models,
-)
-from pp_crawler.crawler.engines.engine import Engine
-from pp_crawler.crawler.modules.module import Module
+from pp_crawler.core.functions import get_logger
+from pp_crawler.crawler.engines.engine import Engine, SearchError
+from pp_crawler.crawler.item import Item
+from pp_crawler.crawler.modules.resolver import Resolution, Resolver
 from pp_crawler.crawler.product import Product
 
 
 def search_website(
     data: tuple[str, str],
     engines: list[Engine],
-) -> tuple[str, Optional[str]]:
+) -> Resolution:
     manufacturer, keyword = data
 
     logger = get_logger()
 
+    fetched = False
     for engine in engines:
-        if site := engine.search(manufacturer, keyword):
+        try:
+            site = engine.search(manufacturer, keyword)
+        except SearchError as e:
+            logger.warning(f"Search failed for {manufacturer}: {e}")
+            continue
+
+        fetched = True
+        if site:
             logger.info(f"Found website: {site}")
-            return manufacturer, site
+            return manufacturer, site, True
 
-    return manufacturer, None
+    return manufacturer, None, fetched
 
 
-class Websites(Module):
+class Websites(Resolver):
+    title = "Searching websites"
+    namespace = "website"
+
     def __init__(
         self,
         descriptor: Path,
@@ -43,44 +45,20 @@ class Websites(Module):
         random_cooldown: float = 0.0,
         chunk_size: int = 64,
     ):
-        self.descriptor = descriptor
+        super().__init__(Product, descriptor, chunk_size)
         self.engines = engines
         self.cooldown = cooldown
         self.random_cooldown = random_cooldown
-        self.chunk_size = chunk_size
-
-    def run(self, pool: Pool) -> None:
-        get_logger().info("Searching websites")
-
-        tmp1 = temp_descriptor(self.descriptor, self.__class__.__name__, "cache")
-        tmp2 = temp_descriptor(self.descriptor, self.__class__.__name__, "tmp")
-
-        search_func = partial(
-            search_website,
-            engines=self.engines,
-        )
-
-        last_id, _ = load_last_id_page(tmp1)
-
-        products_iter = read_models(self.descriptor, Product)
-        skipped_iter = skip_to(products_iter, last_id, lambda x: x.id)
-
-        ws_cache = dict()
-        for models in chunked(skipped_iter, self.chunk_size):
-            models = list(models)
-            pairs = [
-                (m.manufacturer, m.keyword.replace("+", " ") if m.keyword else "")
-                for m in models
-                if m.manufacturer and m.manufacturer not in ws_cache
-            ]
 
-            for manufacturer, website in pool.imap(search_func, pairs):
-                ws_cache[manufacturer] = website
+    def key(self, model: Item) -> Optional[str]:
+        return cast(Product, model).manufacturer
 
-            for m in models:
-                m.website = ws_cache.get(m.manufacturer, None)
+    def task(self, model: Item) -> tuple[Optional[str], str]:
+        keyword = cast(Product, model).keyword
+        return self.key(model), keyword.replace("+", " ") if keyword else ""
 
-            write_models(tmp1, models, mode="a")
+    def worker(self) -> Callable[[Any], Resolution]:
+        return partial(search_website, engines=self.engines)
 
-        concat_files([tmp1], tmp2)
-        tmp2.replace(self.descriptor)
+    def apply(self, model: Item, value: Optional[str]) -> None:
+        cast(Product, model).website = value
@@ -1,44 +1,55 @@
 from functools import partial
-from multiprocessing.pool import Pool
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Iterator, Optional
 
-from bs4 import Tag
+from lxml.html import HtmlElement
 
+from pp_crawler.core.executor import Executor
 from pp_crawler.core.functions import (
-    concat_files,
-    gen_search_urls,
+    commit_models,
+    get_body_from_url,
     get_logger,
-    get_soup_from_url,
-    load_last_id_page,
+    load_max_id,
     read_models,
-    skip_to,
     temp_descriptor,
     write_models,
 )
+from pp_crawler.core.pagination import Paginator, paginate
 from pp_crawler.crawler.plugins.plugin import Plugin
+from pp_crawler.crawler.web.fetcher import AUTO
 from pp_crawler.crawler.website import Website
 
 
 def find_urls(
     args: tuple[str, str],
-    templates: list[Callable[[Tag], list[str]]],
+    templates: list[Callable[[HtmlElement], list[str]]],
     cooldown: float = 0.0,
     random_cooldown: float = 0.0,
-) -> tuple[str, str, set[str]]:
+    mode: str = AUTO,
+    resources: Optional[dict[str, Any]] = None,
+    ready: Optional[str] = None,
+) -> tuple[str, str, Optional[set[str]]]:
     page_url, keyword = args
     logger = get_logger()
 
     if not page_url:
         return keyword, page_url, set()
 
-    soup = get_soup_from_url(page_url, cooldown, random_cooldown)
-    if not soup:
-        return keyword, page_url, set()
+    body = get_body_from_url(
+        page_url,
+        cooldown,
+        random_cooldown,
+        mode=mode,
+        stage="search",
+        resources=resources,
+        ready=ready,
+    )
+    if body is None:
+        return keyword, page_url, None
 
     urls: set[str] = set()
     for template in templates:
-        urls.update(template(soup))
+        urls.update(template(body))
 
     if urls:
         logger.info(f"Found urls:\n\t{'\n\t'.join(urls)}")
@@ -50,12 +61,16 @@ class BaseAnalytics(Plugin):
     def __init__(
         self,
         search_url: str,
-        templates: list[Callable[[Tag], list[str]]],
+        templates: list[Callable[[HtmlElement], list[str]]],
         keywords: list[Optional[str]],
         pages: int,
         descriptor: Path,
         cooldown: float = 0.0,
         random_cooldown: float = 0.0,
+        fetch_mode: str = AUTO,
+        resources: Optional[dict[str, Any]] = None,
+        ready: Optional[str] = None,
+        chunk_size: int = 64,
     ):
         super().__init__()
         self.logger = get_logger()
@@ -66,40 +81,52 @@ class BaseAnalytics(Plugin):
         self.pages = pages
         self.cooldown = cooldown
         self.random_cooldown = random_cooldown
+        self.fetch_mode = fetch_mode
+        self.resources = resources
+        self.ready = ready
+        self.chunk_size = chunk_size
 
-    def scrap_records(self, pool: Pool) -> None:
+    def stream_records(self, pool: Executor) -> Iterator[Website]:
         get_logger().info(f"Searching on {self.__class__.__name__}")
 
         tmp1 = temp_descriptor(self.descriptor, self.__class__.__name__, "cache")
-        tmp2 = temp_descriptor(self.descriptor, self.__class__.__name__, "tmp")
 
-        desc_id, _ = load_last_id_page(self.descriptor)
-        last_id, last_page = load_last_id_page(tmp1)
-        Website._counter = max(int(desc_id or 0), int(last_id or 0)) + 1
+        desc_id = load_max_id(self.descriptor)
+        last_id = load_max_id(tmp1)
+        Website.reserve_ids(max(int(desc_id or 0), int(last_id or 0)) + 1)
 
         worker_func = partial(
             find_urls,
             templates=self.templates,
             cooldown=self.cooldown,
             random_cooldown=self.random_cooldown,
+            mode=self.fetch_mode,
+            resources=self.resources,
+            ready=self.ready,
         )
 
-        urls_iter = gen_search_urls(self.search_url, self.keywords, self.pages)
-        skipped_iter = skip_to(urls_iter, last_page, key=lambda x: x[0])
-
-        for keyword, page, urls in pool.imap(worker_func, skipped_iter):
-            write_models(
-                tmp1,
-                [Website(website=u, keyword=keyword, page=page) for u in urls],
-                mode="a",
-            )
+        listed: set[tuple[Optional[str], Optional[str]]] = set()
+        fetched: set[str] = set()
+        for m in read_models(tmp1, Website):
+            if isinstance(m, Website):
+                listed.add((m.website, m.keyword))
+                fetched.add(m.page or "")
 
-        for i, model in enumerate(
-            read_models(tmp1, Website), start=int(desc_id or 0) + 1
+        pages = Paginator(self.search_url, self.keywords, self.pages, fetched)
+        for keyword, page, urls in paginate(
+            pool, worker_func, pages, self.chunk_size, "search"
         ):
-            model.id = i
-            write_models(tmp2, [model], mode="a")
+            websites = []
+            for url in sorted(urls or ()):
+                if (url, keyword) not in listed:
+                    listed.add((url, keyword))
+                    websites.append(Website(website=url, keyword=keyword, page=page))
+            pages.feedback(page, len(websites) if urls is not None else None)
+            write_models(tmp1, websites, mode="a")
+            yield from websites
+
+    def commit_records(self) -> None:
+        tmp1 = temp_descriptor(self.descriptor, self.__class__.__name__, "cache")
+        tmp2 = temp_descriptor(self.descriptor, self.__class__.__name__, "tmp")
 
-        tmp2.replace(tmp1)
-        concat_files([self.descriptor, tmp1], tmp2)
-        tmp2.replace(self.descriptor)
+        commit_models(self.descriptor, tmp1, tmp2, Website)
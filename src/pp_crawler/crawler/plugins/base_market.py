@@ -1,68 +1,102 @@
+from collections import deque
 from functools import partial
-from multiprocessing.pool import Pool
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Iterator, Optional, cast
 
-from bs4 import Tag
+from lxml.html import HtmlElement
 
+from pp_crawler.core.dispatch import imap_window
+from pp_crawler.core.executor import Executor
+from pp_crawler.core.extraction import ExtractionSpec, compile_specs
 from pp_crawler.core.functions import (
-    concat_files,
-    gen_search_urls,
+    chunked,
+    commit_models,
+    extract_from_url,
+    extract_page,
     get_logger,
-    get_soup_from_url,
     load_last_id_page,
+    load_max_id,
+    page_fetched,
+    program_of,
     read_models,
     skip_to,
     temp_descriptor,
     write_models,
 )
+from pp_crawler.core.keyindex import PairIndex
+from pp_crawler.core.pagination import Paginator, paginate
+from pp_crawler.core.resolutions import MISSING, ResolutionCache
 from pp_crawler.crawler.plugins.plugin import Plugin
 from pp_crawler.crawler.product import Product
+from pp_crawler.crawler.web.fetcher import AUTO, Fetcher
 
 
 def find_product_links(
     data: tuple[str, str],
-    template: Callable[[Tag], list[str]],
+    template: Callable[[HtmlElement], list[str]],
     cooldown: float = 0.0,
     random_cooldown: float = 0.0,
-) -> tuple[str, str, set[str]]:
+    mode: str = AUTO,
+    resources: Optional[dict[str, Any]] = None,
+    ready: Optional[str] = None,
+) -> tuple[str, str, Optional[set[str]]]:
     url, keyword = data
     logger = get_logger()
 
     if not url:
         return keyword, url, set()
 
-    soup = get_soup_from_url(url, cooldown, random_cooldown)
-    if not soup:
-        return keyword, url, set()
-
-    products = set(template(soup))
+    links = extract_from_url(
+        url,
+        template,
+        cooldown,
+        random_cooldown,
+        mode=mode,
+        stage="search",
+        resources=resources,
+        ready=ready,
+    )
+    if links is None:
+        return keyword, url, None
+
+    products = set(links)
     if products:
         logger.info(f"Found products:\n\t{'\n\t'.join(products)}")
 
     return keyword, url, products
 
 
-def find_manufacturer(
-    product: Product,
-    templates: list[Callable[[Tag], Optional[str]]],
+def find_manufacturers(
+    products: list[Product],
+    extractor: Callable[[HtmlElement], Optional[str]],
     cooldown: float = 0.0,
     random_cooldown: float = 0.0,
-) -> Product:
-    logger = get_logger()
-
-    if not product.url:
-        return product
-
-    soup = get_soup_from_url(product.url, cooldown, random_cooldown)
-    if not soup:
-        return product
-
-    for template in templates:
-        if manufacturer := template(soup):
-            product.manufacturer = manufacturer
-            logger.info(f"Found manufacturer: {manufacturer}")
-            return product
+    mode: str = AUTO,
+    resources: Optional[dict[str, Any]] = None,
+    ready: Optional[str] = None,
+) -> list[tuple[Product, bool]]:
+    products = [p for p in products if p.url]
+    pages = Fetcher.fetch_many(
+        [cast(str, p.url) for p in products],
+        cooldown,
+        random_cooldown,
+        mode=mode,
+        stage="product",
+        resources=resources,
+        ready=ready,
+        program=program_of(extractor),
+    )
+    results = []
+    for product, page in zip(products, pages):
+        match_manufacturer(product, extract_page(page, extractor))
+        results.append((product, page_fetched(page)))
+    return results
+
+
+def match_manufacturer(product: Product, manufacturer: Optional[str]) -> Product:
+    if manufacturer:
+        product.manufacturer = manufacturer
+        get_logger().info(f"Found manufacturer: {manufacturer}")
 
     return product
 
@@ -71,14 +105,20 @@ class BaseMarket(Plugin):
     def __init__(
         self,
         search_url: str,
-        product_template: Callable[[Tag], list[str]],
-        templates: list[Callable[[Tag], Optional[str]]],
+        product_template: Callable[[HtmlElement], list[str]],
+        specs: list[ExtractionSpec],
         keywords: list[Optional[str]],
         pages: int,
         descriptor: Path,
         chunk_size: int = 64,
         cooldown: float = 0.0,
         random_cooldown: float = 0.0,
+        fetch_mode: str = AUTO,
+        resources: Optional[dict[str, Any]] = None,
+        product_ready: Optional[str] = None,
+        manufacturer_ready: Optional[str] = None,
+        batch_size: int = 1,
+        canonical_url: Optional[Callable[[str], str]] = None,
     ):
         self.logger = get_logger()
         self.search_url = search_url
@@ -87,57 +127,126 @@ class BaseMarket(Plugin):
         self.pages = pages
         self.cooldown = cooldown
         self.random_cooldown = random_cooldown
+        self.fetch_mode = fetch_mode
+        self.resources = resources
+        self.product_ready = product_ready
+        self.manufacturer_ready = manufacturer_ready
         self.product_template = product_template
-        self.templates = templates
+        self.extractor = compile_specs(tuple(specs))
         self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.canonical_url = canonical_url
 
-    def scrap_records(self, pool: Pool) -> None:
+    def stream_records(self, pool: Executor) -> Iterator[Product]:
         get_logger().info(f"Searching on {self.__class__.__name__}")
 
         tmp1 = temp_descriptor(self.descriptor, self.__class__.__name__, "cache")
         tmp2 = temp_descriptor(self.descriptor, self.__class__.__name__, "tmp")
 
-        desc_id, _ = load_last_id_page(self.descriptor)
-        last_id, last_page = load_last_id_page(tmp1)
-        Product._counter = max(int(desc_id or 0), int(last_id or 0)) + 1
+        desc_id = load_max_id(self.descriptor)
+        last_id = load_max_id(tmp1)
+        Product.reserve_ids(max(int(desc_id or 0), int(last_id or 0)) + 1)
 
         product_func = partial(
             find_product_links,
             template=self.product_template,
             cooldown=self.cooldown,
             random_cooldown=self.random_cooldown,
+            mode=self.fetch_mode,
+            resources=self.resources,
+            ready=self.product_ready,
         )
 
-        urls_iter = gen_search_urls(self.search_url, self.keywords, self.pages)
-        skipped_iter = skip_to(urls_iter, last_page)
-        for keyword, page, urls in pool.imap(product_func, skipped_iter):
-            write_models(
-                tmp1,
-                [Product(url=u, keyword=keyword, page=page) for u in urls],
-                mode="a",
+        listed = PairIndex(
+            temp_descriptor(
+                self.descriptor, self.__class__.__name__, "listed", ".sqlite"
             )
+        )
+        try:
+            fetched: set[str] = set()
+            for path in (self.descriptor, tmp1):
+                for models in chunked(read_models(path, Product), 1024):
+                    products = [m for m in models if isinstance(m, Product)]
+                    listed.update((m.url, m.keyword) for m in products)
+                    if path == tmp1:
+                        fetched.update(m.page or "" for m in products)
+
+            pages = Paginator(self.search_url, self.keywords, self.pages, fetched)
+            for keyword, page, urls in paginate(
+                pool, product_func, pages, self.chunk_size, "search"
+            ):
+                products = []
+                for url in sorted(urls or ()):
+                    if self.canonical_url:
+                        url = self.canonical_url(url)
+                    if listed.add(url, keyword):
+                        products.append(Product(url=url, keyword=keyword, page=page))
+                pages.feedback(page, len(products) if urls is not None else None)
+                write_models(tmp1, products, mode="a")
+
+        finally:
+            listed.close()
+            listed.remove()
 
         manufacturer_func = partial(
-            find_manufacturer,
-            templates=self.templates,
+            find_manufacturers,
+            extractor=self.extractor,
             cooldown=self.cooldown,
             random_cooldown=self.random_cooldown,
+            mode=self.fetch_mode,
+            resources=self.resources,
+            ready=self.manufacturer_ready,
         )
 
         last_id, _ = load_last_id_page(tmp2)
 
-        models_iter = read_models(self.descriptor, Product)
-        skipped_iter = skip_to(models_iter, last_id)
+        models_iter = read_models(tmp1, Product)
+        skipped_iter = skip_to(models_iter, last_id, lambda x: x.id)
+
+        pending: deque[Product] = deque()
+        found: dict[str, Optional[str]] = {}
+        resolving: set[Optional[str]] = set()
+
+        def lookups() -> Iterator[Product]:
+            for product in skipped_iter:
+                pending.append(product)
+                url = product.url
+                if not url or url in found or url in resolving:
+                    continue
+                manufacturer = ResolutionCache.get("manufacturer", url)
+                if manufacturer is not MISSING:
+                    found[url] = cast(Optional[str], manufacturer)
+                    continue
+                resolving.add(url)
+                yield product
+
+        def ready() -> list[Product]:
+            products = []
+            while pending and pending[0].url not in resolving:
+                product = pending.popleft()
+                if product.url:
+                    product.manufacturer = found[product.url]
+                products.append(product)
+            write_models(tmp2, products, mode="a")
+            return products
+
+        batches = chunked(lookups(), self.batch_size)
+        for results in imap_window(
+            pool, manufacturer_func, batches, self.chunk_size, "product"
+        ):
+            for product, loaded in results:
+                url = cast(str, product.url)
+                found[url] = product.manufacturer
+                resolving.discard(url)
+                if loaded:
+                    ResolutionCache.put("manufacturer", url, product.manufacturer)
+            yield from ready()
 
-        for product in pool.imap(manufacturer_func, skipped_iter):
-            write_models(tmp2, [product], mode="a")
+        yield from ready()
 
-        for i, model in enumerate(
-            read_models(tmp1, Product), start=int(desc_id or 0) + 1
-        ):
-            model.id = i
-            write_models(tmp2, [model], mode="a")
+    def commit_records(self) -> None:
+        tmp1 = temp_descriptor(self.descriptor, self.__class__.__name__, "cache")
+        tmp2 = temp_descriptor(self.descriptor, self.__class__.__name__, "tmp")
 
         tmp2.replace(tmp1)
-        concat_files([self.descriptor, tmp1], tmp2)
-        tmp2.replace(self.descriptor)
+        commit_models(self.descriptor, tmp1, tmp2, Product)
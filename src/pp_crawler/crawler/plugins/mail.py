@@ -1,27 +1,24 @@
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
-from bs4 import Tag
+from lxml import etree
+from lxml.html import HtmlElement
 
+from pp_crawler.core.parsing import attributes, has_class
 from pp_crawler.crawler.plugins.base_analytics import BaseAnalytics
+from pp_crawler.crawler.web.fetcher import AUTO
 
+READY = "td.it-title > a.t90.t_grey"
 
-def template1(body: Tag) -> list[str]:
-    result = []
-    parents = {a.parent for a in body.select("td.it-title > a.t90.t_grey")}
-    for p in parents:
-        if not isinstance(p, Tag):
-            return []
 
-        a_tag = p.select_one("a.t90.t_grey")
-        if not a_tag or "href" not in a_tag.attrs:
-            return []
+LINKS = etree.XPath(
+    f"descendant::td[{has_class('it-title')}]"
+    f"/a[{has_class('t90')} and {has_class('t_grey')}][1]/@href"
+)
 
-        href = a_tag["href"]
-        if isinstance(href, str):
-            result.append(href)
 
-    return result
+def template1(body: HtmlElement) -> list[str]:
+    return attributes(LINKS(body))
 
 
 class Mail(BaseAnalytics):
@@ -32,6 +29,8 @@ class Mail(BaseAnalytics):
         descriptor: Path,
         cooldown: float = 0.0,
         random_cooldown: float = 0.0,
+        fetch_mode: str = AUTO,
+        resources: Optional[dict[str, Any]] = None,
     ):
         super().__init__(
             "https://top.mail.ru/Rating/{keyword}/Month/Visitors/{page}.html",
@@ -41,4 +40,7 @@ class Mail(BaseAnalytics):
             descriptor,
             cooldown,
             random_cooldown,
+            fetch_mode,
+            resources,
+            READY,
         )
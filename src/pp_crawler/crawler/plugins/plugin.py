@@ -1,8 +1,19 @@
 from abc import ABC, abstractmethod
-from multiprocessing.pool import Pool
+from typing import Iterator
+
+from pp_crawler.core.executor import Executor
+from pp_crawler.crawler.item import Item
 
 
 class Plugin(ABC):
     @abstractmethod
-    def scrap_records(self, pool: Pool) -> None:
+    def stream_records(self, pool: Executor) -> Iterator[Item]:
+        pass
+
+    def commit_records(self) -> None:
         pass
+
+    def scrap_records(self, pool: Executor) -> None:
+        for _ in self.stream_records(pool):
+            pass
+        self.commit_records()
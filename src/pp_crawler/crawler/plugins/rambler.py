@@ -1,21 +1,21 @@
 from pathlib import Path
+from typing import Any, Optional
 
-from bs4 import Tag
+from lxml import etree
+from lxml.html import HtmlElement
 
+from pp_crawler.core.parsing import attributes
 from pp_crawler.crawler.plugins.base_analytics import BaseAnalytics
+from pp_crawler.crawler.web.fetcher import AUTO
 
+READY = "tr > td > div > div > div > a"
 
-def template1(body: Tag) -> list[str]:
-    hrefs = []
-    for a in body.select("tr > td > div > div > div > a"):
-        if not isinstance(a, Tag):
-            continue
 
-        href = a.get("href")
-        if isinstance(href, str):
-            hrefs.append(href)
+LINKS = etree.XPath("descendant::tr/td/div/div/div/a/@href")
 
-    return hrefs
+
+def template1(body: HtmlElement) -> list[str]:
+    return attributes(LINKS(body))
 
 
 class Rambler(BaseAnalytics):
@@ -25,6 +25,8 @@ class Rambler(BaseAnalytics):
         descriptor: Path,
         cooldown: float = 0.0,
         random_cooldown: float = 0.0,
+        fetch_mode: str = AUTO,
+        resources: Optional[dict[str, Any]] = None,
     ):
         super().__init__(
             "https://top100.rambler.ru/navi/?period=month&sort=viewers&page={page}&_openstat=catalogue_top100",
@@ -34,4 +36,7 @@ class Rambler(BaseAnalytics):
             descriptor,
             cooldown,
             random_cooldown,
+            fetch_mode,
+            resources,
+            READY,
         )
@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+import tempfile
+from hashlib import sha1
+from pathlib import Path
+from time import time
+from typing import Optional
+
+from pp_crawler.core.config import CacheConfig
+from pp_crawler.core.metrics import Metrics
+from pp_crawler.crawler.web.page import Page
+
+
+class PageCache:
+    _config: CacheConfig = CacheConfig()
+    _root: Optional[Path] = None
+
+    @classmethod
+    def set_config(cls, config: CacheConfig, root: Path) -> None:
+        cls._config = config
+        cls._root = root
+        if config.enabled:
+            root.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return cls._config.enabled and cls._root is not None
+
+    @classmethod
+    def replay(cls) -> bool:
+        return cls.enabled() and cls._config.replay
+
+    @classmethod
+    def path(cls, url: str, variant: str) -> Path:
+        if cls._root is None:
+            raise ValueError("Config is not set!")
+        digest = sha1(f"{variant}\n{url}".encode()).hexdigest()
+        return cls._root / digest[:2] / f"{digest}.json.gz"
+
+    @classmethod
+    def ttl(cls, stage: str) -> float:
+        return cls._config.ttl.get(stage, cls._config.default_ttl)
+
+    @classmethod
+    def get(cls, url: str, variant: str, stage: str) -> Optional[Page]:
+        if not cls.enabled():
+            return None
+
+        path = cls.path(url, variant)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, EOFError, json.JSONDecodeError, OSError):
+            Metrics.incr(f"cache.{stage}.miss")
+            return None
+
+        if not cls.replay() and time() - entry["fetched_at"] > cls.ttl(stage):
+            Metrics.incr(f"cache.{stage}.expired")
+            return None
+
+        Metrics.incr(f"cache.{stage}.hit")
+        return Page(
+            entry["url"],
+            entry["markup"],
+            entry["tier"],
+            entry["headers"],
+            entry.get("data"),
+        )
+
+    @classmethod
+    def put(cls, url: str, variant: str, stage: str, page: Page) -> None:
+        if not cls.enabled():
+            return
+
+        path = cls.path(url, variant)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "key": url,
+            "variant": variant,
+            "stage": stage,
+            "fetched_at": time(),
+            "url": page.url,
+            "tier": page.tier,
+            "headers": page.headers,
+            "markup": page.markup,
+            "data": page.data,
+        }
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with (
+                os.fdopen(fd, "wb") as raw,
+                gzip.open(raw, "wt", encoding="utf-8") as f,
+            ):
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
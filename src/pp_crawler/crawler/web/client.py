@@ -0,0 +1,84 @@
+import random
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pp_crawler.core.config import FetchConfig
+from pp_crawler.core.limiter import HostLimiter
+
+
+class _ClientInstance:
+    def __init__(self, conf: FetchConfig, user_agents: list[str]):
+        from pp_crawler.core.functions import get_logger
+
+        self.logger = get_logger()
+        self._conf = conf
+
+        adapter = HTTPAdapter(
+            pool_connections=conf.pool_connections,
+            pool_maxsize=conf.pool_maxsize,
+        )
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.max_redirects = conf.max_redirects
+        self._session.headers.update(
+            {
+                "Accept": "text/html,application/xhtml+xml,*/*;q=0.8",
+                "Accept-Encoding": "gzip, deflate",
+                "Accept-Language": "en-US, en",
+            }
+        )
+        if user_agents:
+            self._session.headers["User-Agent"] = random.choice(user_agents)
+
+    def get(
+        self, url: str, cooldown: float = 0.0, random_cooldown: float = 0.0
+    ) -> Optional[requests.Response]:
+        if not url:
+            raise ValueError("Null url")
+
+        self.logger.info(f"Fetching {url}")
+
+        HostLimiter.wait(url, cooldown, random_cooldown)
+        try:
+            with HostLimiter.slot(url):
+                return self._session.get(url, timeout=self._conf.timeout)
+        except requests.RequestException as e:
+            self.logger.warning(f"Plain request failed for {url}: {e}")
+            return None
+
+    def quit(self) -> None:
+        self._session.close()
+
+
+class Client:
+    _instance: Optional[_ClientInstance] = None
+    _config: Optional[FetchConfig] = None
+    _user_agents: list[str] = []
+    _lock = threading.Lock()
+
+    @classmethod
+    def spawn(cls) -> _ClientInstance:
+        if cls._instance:
+            return cls._instance
+        with cls._lock:
+            if cls._instance:
+                return cls._instance
+            if cls._config:
+                cls._instance = _ClientInstance(cls._config, cls._user_agents)
+                return cls._instance
+        raise ValueError("Config is not set!")
+
+    @classmethod
+    def set_config(cls, config: FetchConfig, user_agents: list[str]) -> None:
+        cls._config = config
+        cls._user_agents = user_agents
+
+    @classmethod
+    def close(cls) -> None:
+        if cls._instance:
+            cls._instance.quit()
+            cls._instance = None
@@ -1,16 +1,25 @@
 # mypy: disable-error-code=no-untyped-call
+import json
 import os
+import queue
 import random
+import shutil
 import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import partial
 from pathlib import Path
-from time import sleep
-from typing import Any, Optional
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, TypeGuard, TypeVar
 
 from selenium import webdriver
 from selenium.common.exceptions import (
     NoAlertPresentException,
     NoSuchElementException,
     TimeoutException,
+    UnexpectedAlertPresentException,
     WebDriverException,
 )
 from selenium.webdriver.common.by import By
@@ -20,8 +29,30 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.wait import WebDriverWait
 from webdriver_manager.firefox import GeckoDriverManager
 
-from pp_crawler.core.config import DriverConfig
+from pp_crawler.core.config import DriverConfig, ResourcePolicy
 from pp_crawler.core.exceptions import CaptchaException
+from pp_crawler.core.limiter import HostLimiter
+from pp_crawler.core.memory import MB, MemorySlots, tree_rss
+from pp_crawler.core.metrics import Metrics
+
+T = TypeVar("T")
+
+
+@dataclass
+class Capture:
+    url: str
+    body: str
+    load_time: float
+    data: Any = None
+
+
+BODY_STABLE = ":stable"
+
+STOP = "stop"
+WINDOW = "window"
+STORAGE = "storage"
+RELAUNCH = "relaunch"
+RECOVERY_TIERS = (STOP, WINDOW, STORAGE, RELAUNCH)
 
 
 def inject_js(filename: str) -> str:
@@ -31,6 +62,66 @@ def inject_js(filename: str) -> str:
         return f.read()
 
 
+def resource_prefs(policy: ResourcePolicy) -> dict[str, Any]:
+    return {
+        "permissions.default.image": 2 if policy.block_images else 1,
+        "permissions.default.stylesheet": 2 if policy.block_stylesheets else 1,
+        "browser.display.use_document_fonts": 0 if policy.block_fonts else 1,
+        "gfx.downloadable_fonts.enabled": not policy.block_fonts,
+        "media.autoplay.default": 5 if policy.block_media else 1,
+        "media.preload.default": 0 if policy.block_media else 1,
+        "media.preload.auto": 0 if policy.block_media else 2,
+    }
+
+
+def profile_root(conf: DriverConfig) -> Path:
+    return Path(conf.profile_dir or Path(conf.temp_dir) / "profiles").resolve()
+
+
+def build_profile_template(conf: DriverConfig) -> Path:
+    root = profile_root(conf)
+    template = root / "template"
+    shutil.rmtree(template, ignore_errors=True)
+    os.makedirs(root, exist_ok=True)
+
+    profile = webdriver.FirefoxProfile(conf.profile_path)
+    if conf.no_cache:
+        profile.set_preference("browser.cache.disk.enable", False)
+        profile.set_preference("browser.cache.memory.enable", False)
+        profile.set_preference("browser.cache.offline.enable", False)
+        profile.set_preference("network.http.use-cache", False)
+        profile.set_preference("dom.webdriver.enabled", False)
+        profile.set_preference("marionette.enabled", False)
+
+    if conf.private:
+        profile.set_preference("browser.privatebrowsing.autostart", True)
+
+    profile.set_preference("intl.accept_languages", "en-US, en")
+
+    for name, value in resource_prefs(conf.resources).items():
+        profile.set_preference(name, value)
+
+    if conf.resources.block_hosts:
+        pac = write_pac(conf.resources.block_hosts, root)
+        profile.set_preference("network.proxy.type", 2)
+        profile.set_preference("network.proxy.autoconfig_url", pac.as_uri())
+        profile.set_preference("privacy.trackingprotection.enabled", True)
+
+    profile.update_preferences()
+    shutil.copytree(profile.path, template)
+    shutil.rmtree(profile.path, ignore_errors=True)
+    return template
+
+
+def write_pac(hosts: list[str], temp_dir: Path) -> Path:
+    pac = temp_dir / f"block_hosts.{os.getpid()}.pac"
+    pac.write_text(
+        inject_js("block_hosts.pac").replace("__BLOCKED_HOSTS__", json.dumps(hosts)),
+        encoding="utf-8",
+    )
+    return pac.resolve()
+
+
 class _DriverInstance:
     def __init__(self, conf: DriverConfig):
         from pp_crawler.core.functions import get_logger
@@ -38,46 +129,68 @@ class _DriverInstance:
         self.logger = get_logger()
         self.logger.setLevel(conf.log_level)
 
-        self._sanitize = inject_js("sanitize.js")
+        self._sanitize = inject_js("sanitize.js") + "return sanitize(arguments[0]);"
+        self._capture = (
+            inject_js("sanitize.js")
+            + inject_js("extract.js")
+            + inject_js("capture.js")
+            + "return capture(arguments[0], arguments[1]);"
+        )
+        self._capture_ready = (
+            inject_js("sanitize.js")
+            + inject_js("extract.js")
+            + inject_js("ready.js")
+            + inject_js("capture.js")
+            + "var removeInvisible = arguments[0];"
+            + "var program = arguments[3];"
+            + "var done = arguments[arguments.length - 1];"
+            + "whenReady(arguments[1], arguments[2], function() {"
+            + " done(capture(removeInvisible, program)); });"
+        )
+        self._ready = (
+            inject_js("ready.js")
+            + "whenReady(arguments[0], arguments[1], arguments[arguments.length - 1]);"
+        )
+        self._set_prefs = inject_js("prefs.js") + "setPrefs(arguments[0]);"
+        self._start_load = inject_js("tabs.js") + "startLoad(arguments[0]);"
+        self._is_loaded = inject_js("tabs.js") + "return isLoaded(arguments[0]);"
         self._conf = conf
+        self._resources = conf.resources
+        self._failures = 0
+        self._pages = 0
+        self._rss_checked = 0
+        self._profile: Optional[Path] = None
+        self._system_access = False
 
         tempfile.tempdir = str(conf.temp_dir)
         os.makedirs(conf.temp_dir, exist_ok=True)
         self._driver = self.make_driver(conf)
 
     def make_driver(self, conf: DriverConfig) -> webdriver.Firefox:
-        profile = None
-        if conf.profile_path:
-            self.logger.info(f"Using profile: {conf.profile_path}")
-            profile = webdriver.FirefoxProfile(conf.profile_path)
-
-        else:
-            self.logger.warning("Using temporary profile")
-            profile = webdriver.FirefoxProfile()
-
-        if conf.no_cache:
-            profile.set_preference("browser.cache.disk.enable", False)
-            profile.set_preference("browser.cache.memory.enable", False)
-            profile.set_preference("browser.cache.offline.enable", False)
-            profile.set_preference("network.http.use-cache", False)
-            profile.set_preference("dom.webdriver.enabled", False)
-            profile.set_preference("marionette.enabled", False)
-
-        if conf.private:
-            profile.set_preference("browser.privatebrowsing.autostart", True)
-
-        profile.set_preference(
-            "general.useragent.override", random.choice(conf.user_agents)
-        )
-        profile.set_preference("intl.accept_languages", "en-US, en")
-        profile.update_preferences()
+        started = perf_counter()
+        template = profile_root(conf) / "template"
+        if not template.is_dir():
+            raise FileNotFoundError(
+                f"Profile template not found at {template}, run Driver.prepare first"
+            )
+
+        self._profile = Path(tempfile.mkdtemp(prefix="profile-", dir=template.parent))
+        shutil.copytree(template, self._profile, dirs_exist_ok=True)
 
         options = Options()
+        options.page_load_strategy = conf.page_load_strategy
         options.add_argument("--no-sandbox")
+        if self._system_access:
+            options.add_argument("-remote-allow-system-access")
+        options.add_argument("-profile")
+        options.add_argument(str(self._profile))
+        if conf.user_agents:
+            options.set_preference(
+                "general.useragent.override", random.choice(conf.user_agents)
+            )
         if conf.headless:
             options.add_argument("--headless")
             options.add_argument("--disable-gpu")
-            options.profile = profile
 
         executable_path = None
         try:
@@ -94,16 +207,174 @@ class _DriverInstance:
         driver = webdriver.Firefox(options=options, service=service)
         driver.set_page_load_timeout(conf.page_load_timeout)
         driver.set_script_timeout(conf.page_load_timeout)
-        driver.execute_script(inject_js("sanitize.js"))
+        self._resources = conf.resources
+
+        elapsed = perf_counter() - started
+        Metrics.incr("driver.launches")
+        Metrics.incr("driver.launch_ms", int(elapsed * 1000))
+        self.logger.info(f"Driver started in {elapsed:.2f}s")
         return driver
 
+    def apply_resources(self, overrides: Optional[dict[str, Any]] = None) -> None:
+        policy = self._conf.resources
+        if overrides:
+            policy = replace(policy, **overrides)
+        if policy == self._resources:
+            return
+
+        if not self._system_access:
+            self.logger.info("Relaunching driver to allow resource overrides")
+            self._system_access = True
+            self.relaunch()
+            if policy == self._resources:
+                return
+
+        try:
+            with self._driver.context(self._driver.CONTEXT_CHROME):
+                self._driver.execute_script(self._set_prefs, resource_prefs(policy))
+            self._resources = policy
+        except WebDriverException:
+            self.logger.warning("Unable to switch resource policy")
+
     def get(
         self,
         url: str,
         cooldown: float = 0.0,
         random_cooldown: float = 0.0,
         remove_invisible: bool = False,
+        ready: Optional[str] = None,
+    ) -> None:
+        self._navigate(
+            url,
+            cooldown,
+            random_cooldown,
+            partial(self._check_page, remove_invisible, ready),
+        )
+
+    def capture(
+        self,
+        url: str,
+        cooldown: float = 0.0,
+        random_cooldown: float = 0.0,
+        remove_invisible: bool = False,
+        resources: Optional[dict[str, Any]] = None,
+        ready: Optional[str] = None,
+        program: Optional[dict[str, Any]] = None,
+    ) -> Optional[Capture]:
+        self.apply_resources(resources)
+        return self._navigate(
+            url,
+            cooldown,
+            random_cooldown,
+            partial(self._capture_page, remove_invisible, ready, program),
+        )
+
+    def capture_many(
+        self,
+        urls: list[str],
+        cooldown: float = 0.0,
+        random_cooldown: float = 0.0,
+        remove_invisible: bool = False,
+        resources: Optional[dict[str, Any]] = None,
+        ready: Optional[str] = None,
+        program: Optional[dict[str, Any]] = None,
+    ) -> list[Optional[Capture]]:
+        capture = partial(
+            self.capture,
+            cooldown=cooldown,
+            random_cooldown=random_cooldown,
+            remove_invisible=remove_invisible,
+            resources=resources,
+            ready=ready,
+            program=program,
+        )
+        tabs = min(self._conf.tabs, len(urls))
+        if tabs <= 1:
+            return [capture(url) for url in urls]
+
+        self.apply_resources(resources)
+        results: list[Optional[Capture]] = [None] * len(urls)
+        done = [False] * len(urls)
+        todo = deque(enumerate(urls))
+        pending: deque[tuple[int, str]] = deque()
+
+        try:
+            free = deque(self._open_tabs(tabs))
+            while todo or pending:
+                while todo and free:
+                    index, url = todo.popleft()
+                    handle = free.popleft()
+                    self._start_tab(handle, url, cooldown, random_cooldown)
+                    pending.append((index, handle))
+
+                index, handle = pending.popleft()
+                results[index] = self._finish_tab(
+                    handle, remove_invisible, ready, program
+                )
+                done[index] = True
+                free.append(handle)
+
+        except (WebDriverException, CaptchaException) as e:
+            self.logger.warning(f"Tab pipeline failed, continuing in one tab: {e}")
+            Metrics.incr("driver.tabs.fallback")
+            self._close_tabs()
+            for index, url in enumerate(urls):
+                if not done[index]:
+                    results[index] = capture(url)
+
+        return results
+
+    def _open_tabs(self, count: int) -> list[str]:
+        handles = self._driver.window_handles
+        while len(handles) < count:
+            self._driver.switch_to.new_window("tab")
+            handles = self._driver.window_handles
+        return list(handles[:count])
+
+    def _close_tabs(self) -> None:
+        try:
+            handles = self._driver.window_handles
+            for handle in handles[1:]:
+                self._driver.switch_to.window(handle)
+                self._driver.close()
+            self._driver.switch_to.window(handles[0])
+        except WebDriverException:
+            self.relaunch()
+
+    def _start_tab(
+        self, handle: str, url: str, cooldown: float, random_cooldown: float
     ) -> None:
+        self.logger.info(f"Going to {url} in tab {handle}")
+        self._driver.switch_to.window(handle)
+        HostLimiter.wait(url, cooldown, random_cooldown)
+        self._driver.execute_script(self._start_load, url)
+
+    def _finish_tab(
+        self,
+        handle: str,
+        remove_invisible: bool,
+        ready: Optional[str],
+        program: Optional[dict[str, Any]],
+    ) -> Capture:
+        self._driver.switch_to.window(handle)
+        WebDriverWait(
+            self._driver, self._conf.page_load_timeout, poll_frequency=0.1
+        ).until(
+            lambda d: d.execute_script(self._is_loaded, self._conf.page_load_strategy)
+        )
+        capture = self._capture_page(remove_invisible, ready, program)
+        self._failures = 0
+        self._pages += 1
+        Metrics.incr("driver.tabs.pages")
+        return capture
+
+    def _navigate(
+        self,
+        url: str,
+        cooldown: float,
+        random_cooldown: float,
+        after: Callable[[], T],
+    ) -> Optional[T]:
         if not url:
             raise ValueError("Null url")
 
@@ -116,53 +387,180 @@ class _DriverInstance:
             and timeout_error < self._conf.max_timeout_attempts
         ):
             try:
-                self.sleep(cooldown, random_cooldown)
-                self._driver.get(url)
-
-                try:
-                    alert = self._driver.switch_to.alert
-                    alert.accept()
-                    self.logger.info("Alert accepted")
-                except NoAlertPresentException:
-                    pass
-
-                try:
-                    self._driver.find_element(
-                        By.XPATH, "//iframe[contains(@src, 'recaptcha')]"
-                    )
-                    captcha_error += 1
-                    raise CaptchaException
-                except NoSuchElementException:
-                    pass
-
-                if remove_invisible:
-                    self.remove_invisible()
-
-                return
+                HostLimiter.wait(url, cooldown, random_cooldown)
+                with HostLimiter.slot(url):
+                    self._driver.get(url)
+                    result = after()
+                self._failures = 0
+                self._pages += 1
+                return result
 
             except TimeoutException:
                 self.logger.warning(f"Slow connection, retying {url}")
-                self._driver.quit()
-                self._driver = self.make_driver(self._conf)
+                self.recover(STOP)
                 timeout_error += 1
 
             except WebDriverException:
                 self.logger.warning(
                     f"Web driver exception, potentially net error, retying {url}"
                 )
-                self._driver.quit()
-                self._driver = self.make_driver(self._conf)
+                self.recover(WINDOW)
                 network_error += 1
 
             except CaptchaException:
                 self.logger.warning(f"Captcha detected, retying {url}")
-                self._driver.quit()
-                self._driver = self.make_driver(self._conf)
+                self.recover(STORAGE)
                 captcha_error += 1
 
-    @classmethod
-    def sleep(cls, cooldown: float = 0.0, random_cooldown: float = 0.0) -> None:
-        sleep(cooldown + random.random() * random_cooldown)
+        return None
+
+    def recover(self, tier: str) -> None:
+        self._failures += 1
+        level = RECOVERY_TIERS.index(tier) + self._failures - 1
+        tier = RECOVERY_TIERS[min(level, len(RECOVERY_TIERS) - 1)]
+        if self._failures > self._conf.max_soft_recoveries or not self.alive():
+            tier = RELAUNCH
+
+        try:
+            if tier == STOP:
+                self._driver.execute_script("window.stop();")
+            elif tier == WINDOW:
+                self._fresh_window()
+            elif tier == STORAGE:
+                self._clear_storage()
+                self._fresh_window()
+        except WebDriverException:
+            tier = RELAUNCH
+
+        if tier == RELAUNCH:
+            self.relaunch()
+
+        Metrics.incr(f"driver.recovery.{tier}")
+        self.logger.info(f"Driver recovered with {tier}")
+
+    def alive(self) -> bool:
+        try:
+            return bool(self._driver.execute_script("return true;"))
+        except WebDriverException:
+            return False
+
+    def relaunch(self) -> None:
+        try:
+            self._driver.quit()
+        except WebDriverException:
+            self.logger.warning("Driver did not quit cleanly")
+        self.remove_profile()
+        self._driver = self.make_driver(self._conf)
+        self._failures = 0
+        self._pages = 0
+        self._rss_checked = 0
+
+    def rss(self) -> int:
+        return tree_rss(self._driver.service.process.pid)
+
+    def recycle_reason(self) -> Optional[str]:
+        if self._conf.max_pages and self._pages >= self._conf.max_pages:
+            return "pages"
+        if not self._conf.max_rss_mb:
+            return None
+        if self._pages - self._rss_checked < max(1, self._conf.rss_check_pages):
+            return None
+        self._rss_checked = self._pages
+        if self.rss() > self._conf.max_rss_mb * MB:
+            return "rss"
+        return None
+
+    def recycle(self) -> None:
+        if reason := self.recycle_reason():
+            self.logger.info(f"Recycling driver after {self._pages} pages ({reason})")
+            Metrics.incr(f"driver.recycle.{reason}")
+            self.relaunch()
+
+    def _fresh_window(self) -> None:
+        old = self._driver.current_window_handle
+        self._driver.switch_to.new_window("tab")
+        new = self._driver.current_window_handle
+        self._driver.switch_to.window(old)
+        self._driver.close()
+        self._driver.switch_to.window(new)
+
+    def _clear_storage(self) -> None:
+        self._driver.delete_all_cookies()
+        self._driver.execute_script(
+            "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+        )
+
+    def _waits_for(self, ready: Optional[str]) -> TypeGuard[str]:
+        return bool(ready) and self._conf.page_load_strategy != "normal"
+
+    def wait_ready(self, ready: str) -> bool:
+        return bool(
+            self._driver.execute_async_script(
+                self._ready, ready, self._conf.ready_timeout * 1000
+            )
+        )
+
+    def _check_page(self, remove_invisible: bool, ready: Optional[str]) -> None:
+        self._accept_alert()
+
+        if self._waits_for(ready):
+            self.wait_ready(ready)
+
+        try:
+            self._driver.find_element(By.XPATH, "//iframe[contains(@src, 'recaptcha')]")
+            raise CaptchaException
+        except NoSuchElementException:
+            pass
+
+        if remove_invisible:
+            self.remove_invisible()
+
+    def _run_capture(
+        self,
+        remove_invisible: bool,
+        ready: Optional[str],
+        program: Optional[dict[str, Any]],
+    ) -> Any:
+        if self._waits_for(ready):
+            return self._driver.execute_async_script(
+                self._capture_ready,
+                remove_invisible,
+                ready,
+                self._conf.ready_timeout * 1000,
+                program,
+            )
+        return self._driver.execute_script(self._capture, remove_invisible, program)
+
+    def _capture_page(
+        self,
+        remove_invisible: bool,
+        ready: Optional[str],
+        program: Optional[dict[str, Any]] = None,
+    ) -> Capture:
+        try:
+            result = self._run_capture(remove_invisible, ready, program)
+        except UnexpectedAlertPresentException:
+            self._accept_alert()
+            result = self._run_capture(remove_invisible, ready, program)
+
+        if result["captcha"]:
+            raise CaptchaException
+
+        self.logger.debug(
+            f"Captured {result['url']} in {result['loadTime']:.2f}s, "
+            f"removed {result['removed']} invisible elements"
+        )
+        return Capture(
+            result["url"], result["body"] or "", result["loadTime"], result["data"]
+        )
+
+    def _accept_alert(self) -> None:
+        try:
+            alert = self._driver.switch_to.alert
+            alert.accept()
+            self.logger.info("Alert accepted")
+        except NoAlertPresentException:
+            pass
 
     def source(self) -> str:
         return self._driver.page_source
@@ -178,21 +576,37 @@ class _DriverInstance:
     def find_element(self, by: str, value: str | None) -> WebElement:
         return self._driver.find_element(by, value)
 
-    def remove_invisible(self) -> None:
-        self._driver.execute_script(self._sanitize)
+    def remove_invisible(self) -> int:
+        result = self._driver.execute_script(self._sanitize, False)
+        removed = int(result["removed"]) if result else 0
+        self.logger.debug(f"Removed {removed} invisible elements")
+        return removed
+
+    def sanitized_body(self) -> Optional[str]:
+        result = self._driver.execute_script(self._sanitize, True)
+        return result["body"] if result else None
+
+    def remove_profile(self) -> None:
+        if self._profile:
+            shutil.rmtree(self._profile, ignore_errors=True)
+            self._profile = None
 
     def quit(self) -> None:
         self._driver.quit()
+        self.remove_profile()
         self.logger.info("Driver has been closed")
 
 
 class Driver:
     _instance: Optional[_DriverInstance] = None
     _config: Optional[DriverConfig] = None
+    _idle: Optional[queue.LifoQueue[_DriverInstance]] = None
+    _free: Optional[threading.BoundedSemaphore] = None
 
     @classmethod
     def spawn(cls, *args: Any, **kwargs: Any) -> _DriverInstance:
         if cls._instance:
+            cls._instance.recycle()
             return cls._instance
         if cls._config:
             cls._instance = _DriverInstance(cls._config)
@@ -203,11 +617,53 @@ class Driver:
     def set_config(cls, config: DriverConfig) -> None:
         cls._config = config
 
+    @classmethod
+    def set_sessions(cls, size: int) -> None:
+        cls._idle = queue.LifoQueue()
+        cls._free = threading.BoundedSemaphore(max(1, size))
+
+    @classmethod
+    @contextmanager
+    def session(cls) -> Iterator[_DriverInstance]:
+        if cls._idle is None or cls._free is None:
+            with MemorySlots.acquire(on_wait=cls.close):
+                yield cls.spawn()
+            return
+
+        with cls._free, MemorySlots.acquire(on_wait=cls.close_idle):
+            try:
+                instance = cls._idle.get_nowait()
+                instance.recycle()
+            except queue.Empty:
+                if not cls._config:
+                    raise ValueError("Config is not set!")
+                instance = _DriverInstance(cls._config)
+            try:
+                yield instance
+            finally:
+                cls._idle.put(instance)
+
+    @classmethod
+    def close_idle(cls) -> None:
+        while cls._idle is not None:
+            try:
+                cls._idle.get_nowait().quit()
+            except queue.Empty:
+                break
+
     @classmethod
     def close(cls) -> None:
         if cls._instance:
             cls._instance.quit()
             cls._instance = None
+        cls.close_idle()
+
+    @classmethod
+    def prepare(cls, conf: DriverConfig) -> None:
+        from pp_crawler.core.functions import get_logger
+
+        template = build_profile_template(conf)
+        get_logger().info(f"Profile template built at {template}")
 
     @classmethod
     def check_installation(cls, conf: DriverConfig) -> None:
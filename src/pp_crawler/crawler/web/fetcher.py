@@ -0,0 +1,309 @@
+import json
+import re
+import threading
+from hashlib import sha1
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import lxml.html
+from lxml import etree
+
+from pp_crawler.core.config import FetchConfig
+from pp_crawler.core.metrics import Metrics
+from pp_crawler.crawler.web.cache import PageCache
+from pp_crawler.crawler.web.client import Client
+from pp_crawler.crawler.web.driver import Capture, Driver
+from pp_crawler.crawler.web.page import Page
+
+AUTO = "auto"
+HTTP = "http"
+BROWSER = "browser"
+
+BLOCKED_STATUSES = {401, 403, 429, 503}
+
+CAPTCHA_XPATH = etree.XPath(
+    "//iframe[contains(@src, 'recaptcha') or contains(@src, 'hcaptcha')]"
+    " | //form[contains(@action, 'validateCaptcha')]"
+    " | //*[contains(@class, 'g-recaptcha') or contains(@class, 'h-captcha')]"
+    " | //*[@id='px-captcha' or @id='challenge-form' or @id='captcha-container']"
+)
+JS_ROOT_XPATH = etree.XPath(
+    "//body//div[@id='root' or @id='app' or @id='__next'][not(*)]"
+)
+TEXT_XPATH = etree.XPath(
+    "//body//text()[not(ancestor::script or ancestor::style"
+    " or ancestor::noscript or ancestor::template)]"
+)
+INVISIBLE_XPATH = etree.XPath(
+    "//head | //script | //style | //noscript | //template"
+    " | //*[@hidden] | //*[@style]"
+)
+INVISIBLE_TAGS = {"head", "script", "style", "noscript", "template"}
+HIDDEN_STYLE_RE = re.compile(
+    r"display\s*:\s*none|visibility\s*:\s*hidden", flags=re.IGNORECASE
+)
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def match_domain(host: str, domains: list[str]) -> bool:
+    return any(host == d or host.endswith(f".{d}") for d in domains)
+
+
+def is_invisible(el: lxml.html.HtmlElement) -> bool:
+    if el.tag in INVISIBLE_TAGS or el.get("hidden") is not None:
+        return True
+    return bool(HIDDEN_STYLE_RE.search(el.get("style") or ""))
+
+
+def page_variant(
+    mode: str, remove_invisible: bool, program: Optional[dict[str, Any]]
+) -> str:
+    variant = f"{mode}+sanitized" if remove_invisible else mode
+    if program:
+        digest = sha1(json.dumps(program, sort_keys=True).encode()).hexdigest()
+        variant = f"{variant}+extract:{digest[:12]}"
+    return variant
+
+
+def captured(capture: Capture) -> bool:
+    return bool(capture.body) or capture.data is not None
+
+
+def strip_invisible(doc: lxml.html.HtmlElement) -> None:
+    for el in INVISIBLE_XPATH(doc):
+        if is_invisible(el):
+            el.drop_tree()
+
+
+class Fetcher:
+    _config: Optional[FetchConfig] = None
+    _tiers: dict[str, str] = {}
+    _tiers_lock = threading.Lock()
+
+    @classmethod
+    def set_config(cls, config: FetchConfig) -> None:
+        cls._config = config
+
+    @classmethod
+    def config(cls) -> FetchConfig:
+        if cls._config:
+            return cls._config
+        raise ValueError("Config is not set!")
+
+    @classmethod
+    def tier(cls, url: str, mode: str = AUTO) -> str:
+        if mode != AUTO:
+            return mode
+
+        conf = cls.config()
+        host = host_of(url)
+        if match_domain(host, conf.browser_domains):
+            return BROWSER
+        if match_domain(host, conf.http_domains):
+            return HTTP
+        if conf.mode != AUTO:
+            return conf.mode
+        with cls._tiers_lock:
+            return cls._tiers.get(host, HTTP)
+
+    @classmethod
+    def fetch(
+        cls,
+        url: str,
+        cooldown: float = 0.0,
+        random_cooldown: float = 0.0,
+        mode: str = AUTO,
+        remove_invisible: bool = False,
+        stage: str = "default",
+        resources: Optional[dict[str, Any]] = None,
+        ready: Optional[str] = None,
+        program: Optional[dict[str, Any]] = None,
+    ) -> Optional[Page]:
+        program = program if cls.config().browser_extraction else None
+        variant = page_variant(mode, remove_invisible, program)
+        if page := PageCache.get(url, variant, stage):
+            return page
+
+        if PageCache.replay():
+            return None
+
+        page = cls._fetch(
+            url,
+            cooldown,
+            random_cooldown,
+            mode,
+            remove_invisible,
+            resources,
+            ready,
+            program,
+        )
+        if page:
+            PageCache.put(url, variant, stage, page)
+        return page
+
+    @classmethod
+    def fetch_many(
+        cls,
+        urls: list[str],
+        cooldown: float = 0.0,
+        random_cooldown: float = 0.0,
+        mode: str = AUTO,
+        remove_invisible: bool = False,
+        stage: str = "default",
+        resources: Optional[dict[str, Any]] = None,
+        ready: Optional[str] = None,
+        program: Optional[dict[str, Any]] = None,
+    ) -> list[Optional[Page]]:
+        program = program if cls.config().browser_extraction else None
+        variant = page_variant(mode, remove_invisible, program)
+        pages: list[Optional[Page]] = [None] * len(urls)
+        browser: list[int] = []
+        for i, url in enumerate(urls):
+            if page := PageCache.get(url, variant, stage):
+                pages[i] = page
+            elif PageCache.replay():
+                continue
+            elif cls.tier(url, mode) == BROWSER:
+                browser.append(i)
+            elif page := cls._fetch(
+                url,
+                cooldown,
+                random_cooldown,
+                mode,
+                remove_invisible,
+                resources,
+                ready,
+                program,
+            ):
+                PageCache.put(url, variant, stage, page)
+                pages[i] = page
+
+        if browser:
+            Metrics.incr("fetch.browser", len(browser))
+            with Driver.session() as driver:
+                captures = driver.capture_many(
+                    [urls[i] for i in browser],
+                    cooldown=cooldown,
+                    random_cooldown=random_cooldown,
+                    remove_invisible=remove_invisible,
+                    resources=resources,
+                    ready=ready,
+                    program=program,
+                )
+            for i, capture in zip(browser, captures):
+                if capture and captured(capture):
+                    page = Page(capture.url, capture.body, BROWSER, data=capture.data)
+                    PageCache.put(urls[i], variant, stage, page)
+                    pages[i] = page
+
+        return pages
+
+    @classmethod
+    def _fetch(
+        cls,
+        url: str,
+        cooldown: float,
+        random_cooldown: float,
+        mode: str,
+        remove_invisible: bool,
+        resources: Optional[dict[str, Any]],
+        ready: Optional[str],
+        program: Optional[dict[str, Any]],
+    ) -> Optional[Page]:
+        from pp_crawler.core.functions import get_logger
+
+        host = host_of(url)
+        if cls.tier(url, mode) == HTTP:
+            page, reason = cls._fetch_http(
+                url, cooldown, random_cooldown, remove_invisible
+            )
+            if not reason:
+                with cls._tiers_lock:
+                    cls._tiers[host] = HTTP
+                return page
+
+            if mode == HTTP:
+                return None
+
+            get_logger().info(f"Escalating {host} to browser: {reason}")
+            Metrics.incr("fetch.escalated")
+            with cls._tiers_lock:
+                cls._tiers[host] = BROWSER
+
+        return cls._fetch_browser(
+            url, cooldown, random_cooldown, remove_invisible, resources, ready, program
+        )
+
+    @classmethod
+    def _fetch_http(
+        cls,
+        url: str,
+        cooldown: float,
+        random_cooldown: float,
+        remove_invisible: bool,
+    ) -> tuple[Optional[Page], Optional[str]]:
+        Metrics.incr("fetch.http")
+        response = Client.spawn().get(url, cooldown, random_cooldown)
+        if response is None:
+            return None, "request failed"
+
+        if response.status_code in BLOCKED_STATUSES:
+            return None, f"status {response.status_code}"
+        if response.status_code >= 400:
+            return None, None
+
+        content_type = response.headers.get("Content-Type", "").lower()
+        if "html" not in content_type:
+            return None, f"content type {content_type or 'unknown'}"
+
+        encoding = response.encoding if "charset" in content_type else None
+        try:
+            doc = lxml.html.document_fromstring(
+                response.content, parser=lxml.html.HTMLParser(encoding=encoding)
+            )
+        except (etree.ParserError, ValueError):
+            return None, "empty body"
+
+        if CAPTCHA_XPATH(doc):
+            return None, "captcha"
+        if JS_ROOT_XPATH(doc):
+            return None, "looks JS-rendered"
+
+        text_length = sum(len(t.strip()) for t in TEXT_XPATH(doc))
+        if text_length < cls.config().min_text_length:
+            return None, "empty body"
+
+        if remove_invisible:
+            strip_invisible(doc)
+
+        markup = lxml.html.tostring(doc, encoding="unicode")
+        return Page(response.url, markup, HTTP, dict(response.headers)), None
+
+    @classmethod
+    def _fetch_browser(
+        cls,
+        url: str,
+        cooldown: float,
+        random_cooldown: float,
+        remove_invisible: bool,
+        resources: Optional[dict[str, Any]],
+        ready: Optional[str],
+        program: Optional[dict[str, Any]],
+    ) -> Optional[Page]:
+        Metrics.incr("fetch.browser")
+        with Driver.session() as driver:
+            capture = driver.capture(
+                url,
+                cooldown=cooldown,
+                random_cooldown=random_cooldown,
+                remove_invisible=remove_invisible,
+                resources=resources,
+                ready=ready,
+                program=program,
+            )
+        if not capture or not captured(capture):
+            return None
+        return Page(capture.url, capture.body, BROWSER, data=capture.data)
@@ -0,0 +1,40 @@
+function capture(removeInvisible, program) {
+
+    var captcha = document.evaluate(
+        "//iframe[contains(@src, 'recaptcha')]",
+        document,
+        null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE,
+        null
+    ).singleNodeValue !== null;
+
+    var removed = 0;
+    if (!captcha && removeInvisible) {
+        removed = sanitize(false).removed;
+    }
+
+    var loadTime = 0;
+    var entries = performance.getEntriesByType("navigation");
+    if (entries.length) {
+        loadTime = entries[0].duration || entries[0].responseEnd;
+    }
+
+    var data = null;
+    if (program && !captcha) {
+        try {
+            data = extract(program);
+        } catch (e) {
+            data = null;
+        }
+    }
+
+    return {
+        url: location.href,
+        captcha: captcha,
+        removed: removed,
+        loadTime: loadTime / 1000,
+        body: document.body && !captcha && data === null ? document.body.outerHTML : null,
+        data: data
+    };
+
+}
@@ -0,0 +1,108 @@
+function selectNodes(path, context) {
+
+    var result = document.evaluate(
+        path,
+        context,
+        null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE,
+        null
+    );
+
+    var nodes = [];
+    for (var i = 0; i < result.snapshotLength; i++) {
+        nodes.push(result.snapshotItem(i));
+    }
+    return nodes;
+
+}
+
+function selectString(path, context) {
+
+    return document.evaluate(
+        "string(" + path + ")",
+        context,
+        null,
+        XPathResult.STRING_TYPE,
+        null
+    ).stringValue;
+
+}
+
+function selectBoolean(path, context) {
+
+    return document.evaluate(
+        "boolean(" + path + ")",
+        context,
+        null,
+        XPathResult.BOOLEAN_TYPE,
+        null
+    ).booleanValue;
+
+}
+
+function extract(program) {
+
+    var body = document.body;
+    if (!body) {
+        return null;
+    }
+
+    if (program.kind === "attributes") {
+        return selectNodes(program.path, body).map(function (node) {
+            if (node.nodeType === Node.ATTRIBUTE_NODE) {
+                return node.value;
+            }
+            return node.getAttribute(program.attribute);
+        });
+    }
+
+    if (program.kind === "texts") {
+        return selectNodes(program.path, body).map(function (node) {
+            return node.textContent;
+        });
+    }
+
+    if (program.kind === "rows") {
+        var rows = [];
+        program.specs.forEach(function (spec) {
+            var containers = selectNodes("descendant::" + spec.container, body);
+            containers.forEach(function (container) {
+                selectNodes(spec.row, container).forEach(function (row) {
+                    rows.push({node: row, index: rows.length, data: [
+                        spec.name,
+                        selectString(spec.label, row),
+                        selectString(spec.value, row)
+                    ]});
+                });
+            });
+        });
+        rows.sort(function (a, b) {
+            if (a.node !== b.node) {
+                var position = a.node.compareDocumentPosition(b.node);
+                if (position & Node.DOCUMENT_POSITION_FOLLOWING) {
+                    return -1;
+                }
+                if (position & Node.DOCUMENT_POSITION_PRECEDING) {
+                    return 1;
+                }
+            }
+            return a.index - b.index;
+        });
+        return rows.map(function (row) {
+            return row.data;
+        });
+    }
+
+    if (program.kind === "anchors") {
+        return selectNodes(program.path, body).map(function (a) {
+            return [
+                a.textContent,
+                a.getAttribute("href"),
+                selectBoolean(program.footer, a)
+            ];
+        });
+    }
+
+    return null;
+
+}
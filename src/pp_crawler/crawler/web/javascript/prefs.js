@@ -0,0 +1,14 @@
+function setPrefs(prefs) {
+
+    for (var name in prefs) {
+        var value = prefs[name];
+        if (typeof value === "boolean") {
+            Services.prefs.setBoolPref(name, value);
+        } else if (typeof value === "number") {
+            Services.prefs.setIntPref(name, value);
+        } else {
+            Services.prefs.setStringPref(name, value);
+        }
+    }
+
+}
@@ -0,0 +1,29 @@
+function whenReady(ready, timeoutMs, callback) {
+
+    var deadline = Date.now() + timeoutMs;
+    var lastLength = -1;
+
+    function check() {
+        var done = false;
+        try {
+            if (ready === ":stable") {
+                var length = document.body ? document.body.textContent.length : 0;
+                done = length > 0 && length === lastLength;
+                lastLength = length;
+            } else {
+                done = document.querySelector(ready) !== null;
+            }
+        } catch (e) {
+            done = false;
+        }
+
+        if (done || Date.now() >= deadline) {
+            callback(done);
+        } else {
+            setTimeout(check, 250);
+        }
+    }
+
+    check();
+
+}
@@ -1,34 +1,27 @@
-(function() {
+function sanitize(returnMarkup) {
 
-    function load_jq(callback) {
-        var script = document.createElement("script")
-        script.type = "text/javascript";
-        script.src = "https://code.jquery.com/jquery-3.5.1.min.js";
-        document.getElementsByTagName("head")[0].appendChild(script);
+    var body = document.body;
+    if (!body) {
+        return {removed: 0, body: null};
     }
 
-    function remove_invisible() {
-        var $ = window.jQuery;
-        $('*').each(function() {
-            if ($(this).css('visibility') == 'hidden' || $(this).css('display') == 'none') {
-                $(this).remove()
+    var hidden = [];
+    var walker = document.createTreeWalker(body, NodeFilter.SHOW_ELEMENT, {
+        acceptNode: function(el) {
+            var style = window.getComputedStyle(el);
+            if (style.display === "none" || style.visibility === "hidden") {
+                hidden.push(el);
+                return NodeFilter.FILTER_REJECT;
             }
-        });
-    }
-
-    function try_remove() {
-        try {
-            remove_invisible()
-        } catch (e) {
-            setTimeout(try_remove, 100)
+            return NodeFilter.FILTER_ACCEPT;
         }
-    }
+    });
+    while (walker.nextNode()) {}
 
-    try {
-        remove_invisible()
-    } catch (e) {
-        load_jq()
-        setTimeout(try_remove, 100)
+    for (var i = 0; i < hidden.length; i++) {
+        hidden[i].remove();
     }
 
-})()
\ No newline at end of file
+    return {removed: hidden.length, body: returnMarkup ? body.outerHTML : null};
+
+}
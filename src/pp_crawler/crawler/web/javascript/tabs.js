@@ -0,0 +1,18 @@
+function startLoad(url) {
+
+    window.__ppPending = true;
+    window.location.href = url;
+
+}
+
+function isLoaded(strategy) {
+
+    if (window.__ppPending !== undefined) {
+        return false;
+    }
+    if (strategy === "normal") {
+        return document.readyState === "complete";
+    }
+    return document.readyState !== "loading";
+
+}
@@ -0,0 +1,11 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class Page:
+    url: str
+    markup: str
+    tier: str
+    headers: dict[str, str] = field(default_factory=dict)
+    data: Any = None
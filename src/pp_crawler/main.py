@@ -2,12 +2,27 @@ import argparse
 import json
 import sys
 from multiprocessing import Pool, Process, Queue
+from multiprocessing.managers import SyncManager
 from pprint import pprint
 from typing import Any
 
 from pp_crawler.core.config import Config
+from pp_crawler.core.executor import ASYNC, AsyncExecutor, Executor
 from pp_crawler.core.functions import get_logger, init_files, load_constructor
-from pp_crawler.core.pool import init_logger, logger_initializer, worker_constructor
+from pp_crawler.core.memory import MemoryGovernor
+from pp_crawler.core.metrics import Metrics
+from pp_crawler.core.pagination import Paginator
+from pp_crawler.core.pool import (
+    SharedState,
+    async_constructor,
+    init_logger,
+    logger_initializer,
+    manager_initializer,
+    worker_constructor,
+    worker_destructor,
+)
+from pp_crawler.core.resolutions import ResolutionCache
+from pp_crawler.crawler.modules.stream import Stream
 from pp_crawler.crawler.web.driver import Driver
 
 
@@ -22,6 +37,11 @@ def main() -> int:
         default="config.json",
         help="Path to JSON file with configuration (default is config.json)",
     )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Serve every page from the fetch cache without opening a browser",
+    )
     args = parser.parse_args()
     pprint(args)
 
@@ -29,8 +49,13 @@ def main() -> int:
         cfg = json.load(f)
 
     c = Config.build(**cfg)
+    if args.replay:
+        c.cache.enabled = True
+        c.cache.replay = True
     pprint(c)
     init_files(c.path)
+    ResolutionCache.set_config(c.resolutions, c.path.resolution_file)
+    Paginator.set_config(c.pagination)
 
     queue: Queue[Any] = Queue(-1)
     logger_process = Process(target=logger_initializer, args=(queue,))
@@ -41,14 +66,42 @@ def main() -> int:
     logger = get_logger()
     logger.info(f"Using thread count: {c.proc_count}")
 
-    Driver.check_installation(c.driver)
-
-    p = Pool(c.proc_count, initializer=worker_constructor, initargs=(queue, c.driver))
+    if not c.cache.replay:
+        Driver.check_installation(c.driver)
+        Driver.prepare(c.driver)
+
+    manager = None
+    governor = None
+    p: Executor
+    if c.executor == ASYNC:
+        logger.info(f"Using async executor with {c.concurrency} tasks in flight")
+        state = SharedState.local(c.proc_count)
+        async_constructor(c, state)
+        p = AsyncExecutor(c.concurrency)
+
+    else:
+        manager = SyncManager()
+        manager.start(manager_initializer)
+
+        state = SharedState.build(manager, c.proc_count)
+        p = Pool(
+            c.proc_count,
+            initializer=worker_constructor,
+            initargs=(queue, c, state),
+        )
+
+    if c.memory.enabled:
+        governor = MemoryGovernor(c.memory, state.allowed, c.proc_count)
+        governor.start()
 
     try:
         pipeline = load_constructor(c.pipeline)
-        for m in pipeline(c):
-            m.run(p)
+        modules = pipeline(c)
+        if c.streaming:
+            Stream(modules, c.stream_window).run(p)
+        else:
+            for m in modules:
+                m.run(p)
         p.close()
         return 0
 
@@ -63,7 +116,16 @@ def main() -> int:
 
     finally:
         p.join()
-
+        if governor:
+            governor.stop()
+        if manager:
+            manager.shutdown()
+        if c.executor == ASYNC:
+            worker_destructor()
+        else:
+            logger.info(f"Main stats: {Metrics.summary()}")
+
+        ResolutionCache.close()
         logger.info("Shutting down")
         queue.put_nowait(None)
         logger_process.join()
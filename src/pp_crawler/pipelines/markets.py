@@ -1,6 +1,6 @@
 from pp_crawler.core.config import Config
 from pp_crawler.core.link_matcher import LinkMatcher
-from pp_crawler.crawler.engines.google import GoogleEngine
+from pp_crawler.crawler.engines.engine import build_engines
 from pp_crawler.crawler.modules.downloader import Downloader
 from pp_crawler.crawler.modules.module import Module
 from pp_crawler.crawler.modules.policies import Policies
@@ -45,6 +45,7 @@ def pipeline(c: Config) -> list[Module]:
                     c.path.descriptor_file,
                     cooldown=1.0,
                     random_cooldown=5.0,
+                    batch_size=c.driver.tabs,
                 ),
                 Walmart(
                     [
@@ -76,12 +77,22 @@ def pipeline(c: Config) -> list[Module]:
                     c.path.descriptor_file,
                     cooldown=1.0,
                     random_cooldown=5.0,
+                    batch_size=c.driver.tabs,
                 ),
             ]
         ),
         Websites(
             c.path.descriptor_file,
-            [GoogleEngine(similarity_threshold=0.7, cooldown=2.0, random_cooldown=2.0)],
+            build_engines(
+                c.engines,
+                {
+                    "google": {
+                        "similarity_threshold": 0.7,
+                        "cooldown": 2.0,
+                        "random_cooldown": 2.0,
+                    }
+                },
+            ),
         ),
         Policies(
             Product,